@@ -0,0 +1,109 @@
+"""Shared helpers of the benchmark scripts
+
+Benchmarks exchange data with a local peer subprocess (a plain Python client
+of the pipe), and results are stored as JSON files of the form::
+
+    {"meta": {...}, "results": [{"name": ..., "params": {...}, ...}, ...]}
+
+so that runs can be compared with :py:func:`compare`.
+"""
+
+import json
+import platform
+import statistics
+import subprocess as sp
+import sys
+import time
+
+import namedpipe
+
+PEER = r"""
+import json, statistics, sys, time
+
+path, role, chunk, count = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+
+if role == "write":  # write count chunks
+    buf = b"x" * chunk
+    with open(path, "wb") as f:
+        for _ in range(count):
+            f.write(buf)
+elif role == "read":  # read until EOF
+    with open(path, "rb") as f:
+        while f.read(1 << 20):
+            pass
+elif role == "stamp":  # write time-stamped messages
+    pad = b"x" * (chunk - 8)
+    with open(path, "wb", buffering=0) as f:
+        for _ in range(count):
+            f.write(time.monotonic_ns().to_bytes(8, "little") + pad)
+            time.sleep(0.0002)
+elif role == "latency":  # read time-stamped messages, print latency stats
+    lat = []
+    with open(path, "rb") as f:
+        while len(msg := f.read(chunk)) == chunk:
+            lat.append(time.monotonic_ns() - int.from_bytes(msg[:8], "little"))
+    print(json.dumps(lat))
+"""
+
+
+def start_peer(path, role, chunk, count, **kwargs) -> sp.Popen:
+    """start the peer subprocess to exercise the pipe at path
+
+    :param role: "write", "read", "stamp" (write time-stamped messages), or
+                 "latency" (read time-stamped messages and print latencies)
+    """
+    return sp.Popen(
+        [sys.executable, "-c", PEER, path, role, str(chunk), str(count)], **kwargs
+    )
+
+
+def stamp(chunk: int) -> bytes:
+    """time-stamped message compatible with the "latency" peer"""
+    return time.monotonic_ns().to_bytes(8, "little") + b"x" * (chunk - 8)
+
+
+def latency_stats(latencies_ns) -> dict:
+    """summarize latencies in microseconds"""
+    lat = sorted(latencies_ns)
+    return {
+        "median_us": statistics.median(lat) / 1e3,
+        "p99_us": lat[min(len(lat) - 1, int(len(lat) * 0.99))] / 1e3,
+        "max_us": lat[-1] / 1e3,
+    }
+
+
+def meta() -> dict:
+    return {
+        "namedpipe": namedpipe.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results, path):
+    with open(path, "w") as f:
+        json.dump({"meta": meta(), "results": results}, f, indent=2)
+
+
+def compare(results, path, key="mbps"):
+    """print speed-up of ``key`` values of the results over those stored in a file
+
+    For latencies (``*_us`` keys), where lower is better, the ratio is
+    inverted, so a speed-up above 1 is an improvement for every key.
+    """
+    with open(path) as f:
+        baseline = {
+            (r["name"], json.dumps(r["params"], sort_keys=True)): r
+            for r in json.load(f)["results"]
+        }
+    for r in results:
+        old = baseline.get((r["name"], json.dumps(r["params"], sort_keys=True)))
+        if old is None or not r.get(key) or not old.get(key):
+            continue
+        ratio = old[key] / r[key] if key.endswith("_us") else r[key] / old[key]
+        print(f"{r['name']:<16} {format_params(r['params']):<48} {ratio:6.2f}x")
+
+
+def format_params(params) -> str:
+    return " ".join(f"{k}={v}" for k, v in params.items())
@@ -0,0 +1,105 @@
+"""Round-trip latency of request/response over duplex NPopen
+
+Sends small requests to a local echo subprocess and times each round trip,
+over a duplex NPopen (``'r+'``, a Unix-domain socket on POSIX) and, as the
+baseline, over a pair of FIFOs (one NPopen per direction).
+
+Usage: python benchmarks/bench_duplex.py [--count N] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import itertools
+import subprocess as sp
+import sys
+import time
+
+from namedpipe import NPopen
+
+from _common import compare, format_params, latency_stats, save
+
+SIZES = [64, 4096]
+
+ECHO = r"""
+import socket, sys
+
+chunk = int(sys.argv[1])
+if len(sys.argv) == 3:  # duplex: connect to the socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(sys.argv[2])
+    fin = fout = open(sock.detach(), "r+b", buffering=0)
+else:  # FIFO pair: requests on the first, responses on the second
+    fin = open(sys.argv[2], "rb", buffering=0)
+    fout = open(sys.argv[3], "wb", buffering=0)
+buf = bytearray(chunk)
+while True:
+    n = 0
+    while n < chunk and (m := fin.readinto(memoryview(buf)[n:])):
+        n += m
+    if n < chunk:
+        break
+    fout.write(buf)
+"""
+
+
+def _round_trips(fin, fout, chunk, count):
+    msg = b"x" * chunk
+    buf = bytearray(chunk)
+    lat = []
+    for _ in range(count):
+        t0 = time.perf_counter_ns()
+        fout.write(msg)
+        n = 0
+        while n < chunk:
+            n += fin.readinto(memoryview(buf)[n:])
+        lat.append(time.perf_counter_ns() - t0)
+    return lat
+
+
+def bench_duplex(chunk, count):
+    with NPopen("r+", bufsize=0) as pipe:
+        proc = sp.Popen([sys.executable, "-c", ECHO, str(chunk), pipe.path])
+        f = pipe.wait()
+        lat = _round_trips(f, f, chunk, count)
+        pipe.close()
+    proc.wait()
+    return latency_stats(lat)
+
+
+def bench_fifo_pair(chunk, count):
+    with NPopen("w", bufsize=0) as req, NPopen("r", bufsize=0) as resp:
+        proc = sp.Popen([sys.executable, "-c", ECHO, str(chunk), req.path, resp.path])
+        fout = req.wait()
+        fin = resp.wait()
+        lat = _round_trips(fin, fout, chunk, count)
+        req.close()
+    proc.wait()
+    return latency_stats(lat)
+
+
+def run(count):
+    for channel, chunk in itertools.product(["duplex", "fifo_pair"], SIZES):
+        bench = bench_duplex if channel == "duplex" else bench_fifo_pair
+        params = {"channel": channel, "chunk": chunk}
+        yield {"name": "round_trip", "params": params, **bench(chunk, count)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000, help="round trips per case")
+    parser.add_argument("--output", help="save results to JSON file")
+    parser.add_argument("--compare", help="compare with results in JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for r in run(args.count):
+        values = " ".join(
+            f"{k}={v:.1f}" for k, v in r.items() if k not in ("name", "params")
+        )
+        print(f"{r['name']:<16} {format_params(r['params']):<48} {values}")
+        results.append(r)
+
+    if args.output:
+        save(results, args.output)
+    if args.compare:
+        print("\nspeed-up relative to", args.compare)
+        compare(results, args.compare, "median_us")
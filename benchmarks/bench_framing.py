@@ -0,0 +1,111 @@
+"""Message rate of length-prefixed records versus line-based text mode
+
+Reads messages of several sizes sent by a local subprocess either as records
+(``RecordWriter``/``RecordReader``) or as newline-terminated lines of a
+text-mode NPopen, and writes records to a reading subprocess.
+
+Usage: python benchmarks/bench_framing.py [--count N] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import itertools
+import subprocess as sp
+import sys
+import time
+
+from namedpipe import NPopen, RecordReader, RecordWriter
+
+from _common import compare, format_params, save, start_peer
+
+SIZES = [64, 1024, 16384]
+BATCHES = [1, 16]
+
+SENDER = r"""
+import sys
+from namedpipe import RecordWriter
+
+path, framing, size, count, batch = sys.argv[1:3] + list(map(int, sys.argv[3:]))
+msg = b"x" * (size - 1)
+with open(path, "wb") as f:
+    if framing == "lines":
+        line = msg + b"\n"
+        for _ in range(count):
+            f.write(line)
+    else:
+        writer = RecordWriter(f)
+        for _ in range(count // batch):
+            writer.writemany([msg] * batch)
+"""
+
+
+def _open_kwargs(framing):
+    return {"encoding": "latin-1"} if framing == "lines" else {}
+
+
+def bench_read(framing, size, batch, count):
+    with NPopen("rt" if framing == "lines" else "r", **_open_kwargs(framing)) as pipe:
+        proc = sp.Popen(
+            [sys.executable, "-c", SENDER, pipe.path, framing]
+            + [str(size), str(count), str(batch)]
+        )
+        f = pipe.wait()
+        t0 = time.perf_counter()
+        n = 0
+        for _ in f if framing == "lines" else RecordReader(f):
+            n += 1
+        elapsed = time.perf_counter() - t0
+    proc.wait()
+    return {"kmsg_s": n / elapsed / 1e3, "mbps": n * size / elapsed / 1e6}
+
+
+def bench_write(framing, size, batch, count):
+    msg = b"x" * (size - 1)
+    with NPopen("wt" if framing == "lines" else "w", **_open_kwargs(framing)) as pipe:
+        proc = start_peer(pipe.path, "read", size, count)
+        f = pipe.wait()
+        t0 = time.perf_counter()
+        if framing == "lines":
+            line = msg.decode("latin-1") + "\n"
+            for _ in range(count):
+                f.write(line)
+        else:
+            writer = RecordWriter(f)
+            for _ in range(count // batch):
+                writer.writemany([msg] * batch)
+        f.close()
+        proc.wait()
+        elapsed = time.perf_counter() - t0
+    return {"kmsg_s": count / elapsed / 1e3, "mbps": count * size / elapsed / 1e6}
+
+
+def run(count):
+    for direction, framing, size, batch in itertools.product(
+        ["read", "write"], ["lines", "records"], SIZES, BATCHES
+    ):
+        if framing == "lines" and batch > 1:
+            continue
+        params = {"framing": framing, "size": size, "batch": batch}
+        bench = bench_read if direction == "read" else bench_write
+        yield {"name": direction, "params": params, **bench(**params, count=count)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="messages per case")
+    parser.add_argument("--output", help="save results to JSON file")
+    parser.add_argument("--compare", help="compare with results in JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for r in run(args.count):
+        values = " ".join(
+            f"{k}={v:.1f}" for k, v in r.items() if k not in ("name", "params")
+        )
+        print(f"{r['name']:<16} {format_params(r['params']):<48} {values}")
+        results.append(r)
+
+    if args.output:
+        save(results, args.output)
+    if args.compare:
+        print("\nspeed-up relative to", args.compare)
+        compare(results, args.compare, "kmsg_s")
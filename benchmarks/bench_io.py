@@ -0,0 +1,139 @@
+"""Throughput and latency of NPopen read and write paths
+
+Measures MB/s of the read and write paths across bufsize, kernel pipe size,
+binary vs text mode, and chunk size, as well as the per-message latency of
+small messages. A local subprocess plays the client.
+
+Usage: python benchmarks/bench_io.py [--size MB] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import itertools
+import json
+import subprocess as sp
+import time
+
+from namedpipe import NPopen
+
+from _common import compare, format_params, latency_stats, save, stamp, start_peer
+
+BUFSIZES = [-1, 0, 1 << 20]
+PIPE_SIZES = [None, 1 << 20]
+CHUNKS = [4096, 1 << 16, 1 << 20]
+
+
+def _open_kwargs(text):
+    # latin-1 keeps one character per byte
+    return {"encoding": "latin-1", "newline": ""} if text else {}
+
+
+def bench_read(bufsize, pipe_size, text, chunk, size):
+    count = size // chunk
+    with NPopen(
+        "rt" if text else "r", bufsize, pipe_size=pipe_size, **_open_kwargs(text)
+    ) as pipe:
+        proc = start_peer(pipe.path, "write", chunk, count)
+        f = pipe.wait()
+        t0 = time.perf_counter()
+        nread = 0
+        while data := f.read(chunk):
+            nread += len(data)
+        elapsed = time.perf_counter() - t0
+    proc.wait()
+    return {"mbps": nread / elapsed / 1e6}
+
+
+def bench_write(bufsize, pipe_size, text, chunk, size):
+    count = size // chunk
+    data = "x" * chunk if text else b"x" * chunk
+    with NPopen(
+        "wt" if text else "w", bufsize, pipe_size=pipe_size, **_open_kwargs(text)
+    ) as pipe:
+        proc = start_peer(pipe.path, "read", chunk, count)
+        f = pipe.wait()
+        t0 = time.perf_counter()
+        for _ in range(count):
+            f.write(data)
+        f.close()
+        proc.wait()
+        elapsed = time.perf_counter() - t0
+    return {"mbps": count * chunk / elapsed / 1e6}
+
+
+def bench_read_latency(bufsize, chunk, count):
+    with NPopen("r", bufsize) as pipe:
+        proc = start_peer(pipe.path, "stamp", chunk, count)
+        f = pipe.wait()
+        lat = []
+        buf = bytearray(chunk)
+        while True:
+            n = 0
+            while n < chunk and (m := f.readinto(memoryview(buf)[n:])):
+                n += m
+            if n < chunk:
+                break
+            lat.append(time.monotonic_ns() - int.from_bytes(buf[:8], "little"))
+    proc.wait()
+    return latency_stats(lat)
+
+
+def bench_write_latency(bufsize, chunk, count):
+    with NPopen("w", bufsize) as pipe:
+        proc = start_peer(pipe.path, "latency", chunk, count, stdout=sp.PIPE)
+        f = pipe.wait()
+        for _ in range(count):
+            f.write(stamp(chunk))
+            f.flush()
+            time.sleep(0.0002)
+        f.close()
+        out, _ = proc.communicate()
+    return latency_stats(json.loads(out))
+
+
+def run(size):
+    for direction, (bufsize, pipe_size, text, chunk) in itertools.product(
+        ["read", "write"], itertools.product(BUFSIZES, PIPE_SIZES, [False, True], CHUNKS)
+    ):
+        if text and bufsize == 0:
+            continue  # unbuffered text I/O is not allowed
+        params = {
+            "bufsize": bufsize,
+            "pipe_size": pipe_size,
+            "text": text,
+            "chunk": chunk,
+        }
+        bench = bench_read if direction == "read" else bench_write
+        yield {"name": direction, "params": params, **bench(**params, size=size)}
+
+    for direction, bufsize in itertools.product(["read", "write"], [-1, 0]):
+        params = {"bufsize": bufsize, "chunk": 64}
+        bench = bench_read_latency if direction == "read" else bench_write_latency
+        yield {
+            "name": f"{direction}_latency",
+            "params": params,
+            **bench(**params, count=2000),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=64, help="MB per case")
+    parser.add_argument("--output", help="save results to JSON file")
+    parser.add_argument("--compare", help="compare with results in JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for r in run(args.size << 20):
+        values = " ".join(
+            f"{k}={v:.1f}" for k, v in r.items() if k not in ("name", "params")
+        )
+        print(f"{r['name']:<16} {format_params(r['params']):<48} {values}")
+        results.append(r)
+
+    if args.output:
+        save(results, args.output)
+    if args.compare:
+        print("\nthroughput speed-up relative to", args.compare)
+        compare(results, args.compare)
+        print("\nmedian latency speed-up relative to", args.compare)
+        compare(results, args.compare, "median_us")
@@ -0,0 +1,41 @@
+"""Read throughput of NPopen versus kernel pipe size (Linux)
+
+A writer subprocess pushes raw 1080p rgb24 frames through the pipe while the
+main process reads them back with ``f.read(nbytes)``.
+
+Usage: python benchmarks/bench_pipe_size.py [--frames N]
+"""
+
+import argparse
+import time
+
+from namedpipe import NPopen
+
+from _common import start_peer
+
+FRAME_SIZE = 1920 * 1080 * 3
+
+
+def run(pipe_size, nframes, frame_size=FRAME_SIZE):
+    with NPopen("r", pipe_size=pipe_size) as pipe:
+        proc = start_peer(pipe.path, "write", frame_size, nframes)
+        f = pipe.wait()
+        effective = pipe.pipe_size
+        t0 = time.perf_counter()
+        nread = 0
+        while b := f.read(frame_size):
+            nread += len(b)
+        elapsed = time.perf_counter() - t0
+    proc.wait()
+    return effective, nread / elapsed / 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'requested':>10} {'effective':>10} {'MB/s':>10}")
+    for size in (None, 1 << 16, 1 << 18, 1 << 20, 1 << 23):
+        effective, rate = run(size, args.frames)
+        print(f"{str(size):>10} {str(effective):>10} {rate:10.1f}")
@@ -0,0 +1,86 @@
+"""Parsing rate of ffmpeg-style progress output
+
+Reads ``-progress``-like ``key=value`` blocks sent by a local subprocess,
+either line by line from a text-mode NPopen or with ``ProgressReader``, and
+reports parsed blocks per second and CPU time per block.
+
+Usage: python benchmarks/bench_progress.py [--count N] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import subprocess as sp
+import sys
+import time
+
+from namedpipe import NPopen, ProgressReader
+
+from _common import compare, format_params, save
+
+SENDER = r"""
+import sys
+
+path, count = sys.argv[1], int(sys.argv[2])
+with open(path, "w") as f:
+    for i in range(count):
+        f.write(
+            f"frame={i}\nfps=25.00\nstream_0_0_q=28.0\nbitrate= 512.0kbits/s\n"
+            f"total_size={i * 2048}\nout_time_us={i * 40000}\nout_time_ms={i * 40000}\n"
+            f"out_time=00:00:00.000000\ndup_frames=0\ndrop_frames=0\nspeed=1.00x\n"
+            f"progress={'end' if i == count - 1 else 'continue'}\n"
+        )
+"""
+
+
+def parse_text(f):
+    """typical hand-rolled parser of a text-mode stream"""
+    block = {}
+    for line in f:
+        key, _, value = line.strip().partition("=")
+        block[key] = value
+        if key == "progress":
+            yield block
+            block = {}
+
+
+def bench(reader, keys, count):
+    mode = "rt" if reader == "text" else "r"
+    with NPopen(mode) as pipe:
+        proc = sp.Popen([sys.executable, "-c", SENDER, pipe.path, str(count)])
+        f = pipe.wait()
+        t0, c0 = time.perf_counter(), time.process_time()
+        if reader == "text":
+            blocks = parse_text(f)
+        else:
+            blocks = ProgressReader(f, keys=["frame", "out_time_us"] if keys else None)
+        n = sum(1 for _ in blocks)
+        elapsed, cpu = time.perf_counter() - t0, time.process_time() - c0
+    proc.wait()
+    return {"kblocks_s": n / elapsed / 1e3, "cpu_us": cpu / n * 1e6}
+
+
+def run(count):
+    for reader, keys in [("text", False), ("progress", False), ("progress", True)]:
+        params = {"reader": reader, "keys": keys}
+        yield {"name": "progress", "params": params, **bench(**params, count=count)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="blocks per case")
+    parser.add_argument("--output", help="save results to JSON file")
+    parser.add_argument("--compare", help="compare with results in JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for r in run(args.count):
+        values = " ".join(
+            f"{k}={v:.2f}" for k, v in r.items() if k not in ("name", "params")
+        )
+        print(f"{r['name']:<16} {format_params(r['params']):<48} {values}")
+        results.append(r)
+
+    if args.output:
+        save(results, args.output)
+    if args.compare:
+        print("\nspeed-up relative to", args.compare)
+        compare(results, args.compare, "kblocks_s")
@@ -7,6 +7,49 @@ if _os_name == "nt":
 else:
     from ._posix import NPopen
 
+# feature classes are imported on first access to keep ``import namedpipe`` cheap
+_LAZY = {
+    "FrameReader": "._frame",
+    "PipeSession": "._session",
+    "PipeStats": "._stats",
+    "ProgressReader": "._progress",
+    "RecordReader": "._record",
+    "RecordWriter": "._record",
+    "ShmChannel": "._shm",
+    "ShmNPopen": "._shm",
+    "WriteBehindIO": "._writebehind",
+    "shm_connect": "._shm",
+}
+if _os_name != "nt":
+    _LAZY.update(
+        {
+            "PipePool": "._pool",
+            "PipeSelector": "._selector",
+            "PipeTee": "._tee",
+            "configure": "._posix",
+            "multiplex": "._selector",
+        }
+    )
+
+__all__ = ["NPopen", *_LAZY]
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY})
+
+
 NPopen.__doc__ = r"""Create a named pipe. 
 
 On POSIX, the class uses py:func:`os.mkfifo()` to create the named pipe. On 
@@ -16,7 +59,11 @@ function of the ``pywin32`` package. The arguments to NPopen are as follows.
 ``bufsize`` will be supplied as the corresponding argument to the open() function 
 when creating the pipe file objects:
 
-* ``0`` means unbuffered (read and write are one system call and can return short)
+* ``0`` means unbuffered (read and write are one system call and can return short). 
+  The raw stream additionally offers ``readinto_exact(b)``, which fills a 
+  caller-provided buffer by repeating the reads (returning short only at EOF), 
+  and ``readexactly(n)``, which raises ``EOFError`` if EOF is reached early. 
+  They read directly into the destination memory without an intermediate buffer.
 * ``1`` means line buffered (only usable in a text mode)
 * any other positive value means use a buffer of approximately that size
 * negative ``bufsize`` (the default) means the system default of 
@@ -60,12 +107,71 @@ Any other error handling name that has been registered with
   place. If ``newline`` is any of the other legal values, any ``'\n'`` 
   characters written are translated to the given string.
 
-By default, POSIX named pipe is created with a path signature ``$TMPDIR/pipe[a-z0-9_]{8}/[0-9]+``
+``pipe_size`` requests the capacity of the kernel pipe buffer in bytes, which 
+is separate from the userspace buffer set by ``bufsize``. On Linux, it is 
+applied with ``fcntl(F_SETPIPE_SZ)`` once the client connects and is capped at 
+``/proc/sys/fs/pipe-max-size``. The kernel rounds the size up, and the effective 
+size is reported by the ``NPopen.pipe_size`` property. It is ignored on other 
+POSIX platforms. On Windows, it sets both the input and output buffer sizes 
+passed to ``CreateNamedPipe()``, which default to the system minimum.
+
+On Windows, ``in_buffer_size`` and ``out_buffer_size`` set the input and output 
+buffer sizes separately, overriding ``pipe_size``, and ``max_instances`` (1 by 
+default, 255 for unlimited) sets the number of instances which may be created 
+with the same ``name``. The system treats the buffer sizes as advisory; 
+``NPopen.pipe_size`` reports those of the connected pipe.
+
+If ``stats`` is ``True`` or a callable, the stream returned by ``wait()`` is 
+instrumented to collect I/O statistics in ``NPopen.stats`` (a ``PipeStats`` 
+object): bytes transferred, number of system calls, time blocked in read and 
+write, and time spent waiting for the client connection. A callable is called 
+as ``stats(op, nbytes, elapsed)`` after every recorded operation. The stream 
+is not instrumented by default, so there is no overhead unless enabled.
+
+If ``readahead`` is a positive integer, a read-only pipe spawns a background 
+thread when connected, which keeps reading from the pipe into a bounded queue 
+of ``readahead`` preallocated buffers (each holding up to the kernel pipe size 
+on Linux or 64 KiB otherwise). The writer on the other end is thus not stalled 
+while the program processes the data read, until all the buffers are full. As 
+the thread owns the pipe, it cannot be the source of ``pump_to()`` or 
+``PipeTee``.
+
+If ``writebehind`` is a positive integer, a write-only pipe hands the written 
+data over to a background writer thread, so ``write()`` returns without waiting 
+for the reader. Writes smaller than ``bufsize`` (64 KiB if not positive) are 
+combined, while larger buffers are queued by reference without copying and must 
+not be modified until written. ``writebehind`` sets the high-water mark: once 
+this many bytes are queued, ``write()`` blocks until the queue drains. The 
+stream (a ``WriteBehindIO`` object, or the ``buffer`` of a text stream) offers 
+``flush()`` to hand over combined writes without waiting and ``drain()`` to 
+wait until everything is written to the pipe.
+
+If ``overlapped`` is a positive integer, the Windows pipe is created with 
+``FILE_FLAG_OVERLAPPED`` and its stream (an ``OverlappedRawIO`` object) keeps up 
+to ``overlapped`` asynchronous reads or writes of 64 KiB in flight, instead of 
+issuing one blocking ``ReadFile()`` or ``WriteFile()`` at a time. Reads are 
+issued ahead of the consumer, so the client is not stalled while the data is 
+processed. Writes are copied and return once issued; a write error is raised by 
+a later ``write()``, ``flush()``, or ``close()`` of the raw stream, and the raw 
+stream's ``flush()`` waits until all the writes complete. It is not available 
+on POSIX.
+
+A duplex ``mode`` containing ``'+'`` (e.g., ``'r+'``) creates, on POSIX, a 
+Unix-domain socket listening at ``NPopen.path`` instead of a FIFO, as a FIFO 
+opened for both reading and writing cannot carry data in both directions. The 
+client connects to the path with an ``AF_UNIX`` stream socket (``unix://`` URL 
+in ffmpeg), and ``wait()`` returns a stream whose reads and writes are 
+independently buffered (``io.BufferedRWPair``). ``pipe_size`` then sets the 
+socket buffer sizes.
+
+By default, POSIX named pipe is created with a path signature ``$TMPDIR/pipe<pid>-[a-z0-9_]{8}/[0-9]+``
 while Windows named pipe is created with ``\\.\pipe\[0-9]+``. In other words, 
 the named pipe has a numeric name. The pipe name can be customized by ``name`` 
 argument. Given pipe name will replace the numeric pipe name but still placed in
 the same directory. In POSIX, ``name`` may be an absolute path to place the pipe
-outside of the ``$TMPDIR/pipe[a-z0-9_]{8}`` directory.
+outside of the ``$TMPDIR/pipe<pid>-[a-z0-9_]{8}`` directory. The base directory 
+(e.g., ``/dev/shm``) and whether the directory is kept between pipes are set by 
+``namedpipe.configure()`` on POSIX.
 
 ``NPopen`` is also a context manager and therefore supports the ``with`` 
 statement. In this example, pipe and its stream are closed after the ``with`` 
@@ -96,4 +202,8 @@ first call, however, will have an effect.
 NPopen.wait.__doc__ = """Wait for client connection
 
 Blocks until the other end of the pipe is opened by a client.
+
+On POSIX, ``timeout`` (in seconds) limits the wait, raising ``TimeoutError`` if 
+no client connects in time, and calling ``close()`` from another thread cancels 
+a pending ``wait()``, which then raises ``RuntimeError``.
 """
@@ -0,0 +1,109 @@
+from typing import IO, Iterator, Optional, Sequence
+
+
+def _readinto_full(stream: IO, mv: memoryview) -> int:
+    """fill buffer from stream, looping over short reads
+
+    :return: number of bytes read, less than ``len(mv)`` only at EOF
+    """
+    if hasattr(stream, "readinto_exact"):
+        return stream.readinto_exact(mv)
+    nread = 0
+    size = len(mv)
+    while nread < size:
+        n = stream.readinto(mv[nread:])
+        if not n:
+            break
+        nread += n
+    return nread
+
+
+class FrameReader:
+    """Read fixed-size frames from a binary stream into preallocated buffers
+
+    :param stream: binary stream to read from, e.g., ``NPopen.stream``
+    :param frame_size: number of bytes per frame
+    :param nbuffers: number of frame buffers in the internal ring, defaults to 2
+    :param dtype: NumPy data type of the frames. If given, :py:meth:`read`
+                  returns a NumPy array sharing memory with the ring buffer
+    :param shape: shape of NumPy frame array, defaults to 1D
+
+    A frame returned by :py:meth:`read` remains valid until the reader wraps
+    around the ring, i.e., for ``nbuffers - 1`` subsequent reads. Use
+    :py:meth:`readinto` to read frames into a caller-provided buffer instead.
+
+    .. code-block:: python
+
+       with NPopen('r') as pipe:
+           proc = sp.Popen(['ffmpeg', ..., '-f', 'rawvideo', '-pix_fmt', 'rgb24', pipe.path])
+           reader = FrameReader(pipe.wait(), w * h * 3, dtype='uint8', shape=(h, w, 3))
+           for frame in reader:
+               ...
+    """
+
+    def __init__(
+        self,
+        stream: IO,
+        frame_size: int,
+        nbuffers: int = 2,
+        dtype=None,
+        shape: Optional[Sequence[int]] = None,
+    ):
+        if frame_size <= 0:
+            raise ValueError("frame_size must be a positive integer")
+        if nbuffers <= 0:
+            raise ValueError("nbuffers must be a positive integer")
+
+        self.stream = stream
+        self.frame_size = frame_size
+
+        ring = memoryview(bytearray(frame_size * nbuffers))
+        self._slots = [
+            ring[i : i + frame_size] for i in range(0, len(ring), frame_size)
+        ]
+        if dtype is None:
+            self._frames = self._slots
+        else:
+            import numpy as np
+
+            self._frames = [
+                np.frombuffer(slot, dtype).reshape(-1 if shape is None else shape)
+                for slot in self._slots
+            ]
+        self._next = 0
+
+    def readinto(self, b) -> bool:
+        """Read next frame into a pre-allocated, writable bytes-like object ``b``
+
+        :return: False if the stream has reached EOF
+        :raises EOFError: if the stream ends in the middle of a frame
+        """
+        with memoryview(b) as mv, mv.cast("B") as flat:
+            if len(flat) < self.frame_size:
+                raise ValueError("buffer is too small for a frame")
+            return self._fill(flat[: self.frame_size])
+
+    def read(self) -> Optional[memoryview]:
+        """Read next frame into the internal ring buffer
+
+        :return: frame data (NumPy array if ``dtype`` is set) or None if the
+                 stream has reached EOF
+        :raises EOFError: if the stream ends in the middle of a frame
+        """
+        i = self._next
+        if not self._fill(self._slots[i]):
+            return None
+        self._next = (i + 1) % len(self._slots)
+        return self._frames[i]
+
+    def _fill(self, mv: memoryview) -> bool:
+        n = _readinto_full(self.stream, mv)
+        if n == len(mv):
+            return True
+        if n:
+            raise EOFError(f"stream ended with a partial frame ({n} bytes)")
+        return False
+
+    def __iter__(self) -> Iterator[memoryview]:
+        while (frame := self.read()) is not None:
+            yield frame
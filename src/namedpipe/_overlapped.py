@@ -0,0 +1,352 @@
+import ctypes
+import io
+from collections import deque
+from ctypes import wintypes
+from typing import Deque, Optional, Tuple
+
+from ._rawio import ExactReadMixin
+from ._win32 import (
+    ERROR_BROKEN_PIPE,
+    ERROR_IO_PENDING,
+    ERROR_MORE_DATA,
+    ERROR_PIPE_CONNECTED,
+    INVALID_HANDLE_VALUE,
+    PyHANDLE,
+    _kernel32,
+    _win_error,
+)
+
+FILE_FLAG_OVERLAPPED = 0x40000000
+ERROR_NO_DATA = 232
+
+OVERLAPPED_SIZE = 65536  # buffer size of each overlapped request
+
+
+class OVERLAPPED(ctypes.Structure):
+    _fields_ = [
+        ("Internal", ctypes.c_size_t),
+        ("InternalHigh", ctypes.c_size_t),
+        ("Offset", wintypes.DWORD),
+        ("OffsetHigh", wintypes.DWORD),
+        ("hEvent", wintypes.HANDLE),
+    ]
+
+
+def _last_error() -> int:
+    return ctypes.get_last_error()
+
+
+def _error(code: int) -> OSError:
+    if code in (ERROR_BROKEN_PIPE, ERROR_NO_DATA):
+        return BrokenPipeError(code, "The pipe has been ended")
+    return _win_error(code)
+
+
+def _create_event(kernel32) -> int:
+    """manual-reset event to signal the completion of a request"""
+    event = kernel32.CreateEventW(None, True, False, None)
+    if not event:
+        raise _win_error(_last_error())
+    return event
+
+
+def connect(handle: PyHANDLE):
+    """ConnectNamedPipe() on a pipe handle created with FILE_FLAG_OVERLAPPED,
+    waiting for the client"""
+    kernel32 = _kernel32()
+    ov = OVERLAPPED(hEvent=_create_event(kernel32))
+    try:
+        if kernel32.ConnectNamedPipe(handle, ctypes.byref(ov)):
+            return
+        code = _last_error()
+        if code == ERROR_IO_PENDING:
+            n = wintypes.DWORD(0)
+            if kernel32.GetOverlappedResult(
+                handle, ctypes.byref(ov), ctypes.byref(n), True
+            ):
+                return
+            code = _last_error()
+        if code != ERROR_PIPE_CONNECTED:  # client connected before the call
+            raise _win_error(code)
+    finally:
+        kernel32.CloseHandle(ov.hEvent)
+
+
+class _Request:
+    """buffer and OVERLAPPED structure of one I/O request"""
+
+    __slots__ = ("buf", "view", "ov", "nbytes")
+
+    def __init__(self, size: int, event: int):
+        self.buf = (ctypes.c_char * size)()
+        self.view = memoryview(self.buf).cast("B")
+        self.ov = OVERLAPPED(hEvent=event)
+        self.nbytes = wintypes.DWORD(0)
+
+
+class OverlappedQueue:
+    """Outstanding overlapped requests in one direction of a pipe handle
+
+    :param handle: pipe handle created with ``FILE_FLAG_OVERLAPPED``
+    :param depth: maximum number of outstanding requests
+    :param size: buffer size of each request in bytes
+
+    Each request owns a buffer and an event, which are reused. Requests on
+    a pipe complete in the order they are issued, so the queue only waits
+    for the oldest one. A request taken by :py:meth:`complete` is not reused
+    until it is handed back by :py:meth:`release`.
+    """
+
+    def __init__(self, handle: PyHANDLE, depth: int, size: int = OVERLAPPED_SIZE):
+        if depth <= 0:
+            raise ValueError("depth must be a positive integer")
+        self.kernel32 = _kernel32()
+        self.handle = handle
+        self.size = size
+        self._free: Deque[_Request] = deque()
+        self._pending: Deque[_Request] = deque()
+        try:
+            for _ in range(depth):
+                self._free.append(_Request(size, _create_event(self.kernel32)))
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def pending(self) -> int:
+        """int: number of outstanding requests"""
+        return len(self._pending)
+
+    @property
+    def free(self) -> int:
+        """int: number of requests which can be issued without waiting"""
+        return len(self._free)
+
+    def _issued(self, req: _Request, ok: bool):
+        # an immediate completion also signals the event and is collected by
+        # GetOverlappedResult() as the pending ones
+        if not ok:
+            code = _last_error()
+            if code != ERROR_IO_PENDING:
+                self._free.appendleft(req)
+                raise _error(code)
+        self._pending.append(req)
+
+    def submit_read(self) -> bool:
+        """Issue a read into a free request
+
+        :return: False if all the requests are outstanding
+        :raises BrokenPipeError: if the writer has closed the pipe
+        """
+        if not self._free:
+            return False
+        req = self._free.popleft()
+        ok = self.kernel32.ReadFile(
+            self.handle, req.buf, self.size, None, ctypes.byref(req.ov)
+        )
+        self._issued(req, ok)
+        return True
+
+    def submit_write(self, b: memoryview) -> int:
+        """Copy the head of ``b`` into a free request and issue its write
+
+        Waits for the oldest write to complete if all the requests are
+        outstanding.
+
+        :return: number of bytes copied, up to the request size
+        """
+        if not self._free:
+            self.release(self.complete()[0])
+        req = self._free.popleft()
+        n = min(len(b), self.size)
+        req.view[:n] = b[:n]
+        ok = self.kernel32.WriteFile(
+            self.handle, req.buf, n, None, ctypes.byref(req.ov)
+        )
+        self._issued(req, ok)
+        return n
+
+    def complete(self) -> Tuple[_Request, int]:
+        """Wait for the oldest outstanding request to complete
+
+        :return: the request and the number of bytes transferred
+        """
+        req = self._pending.popleft()
+        ok = self.kernel32.GetOverlappedResult(
+            self.handle, ctypes.byref(req.ov), ctypes.byref(req.nbytes), True
+        )
+        if not ok:
+            code = _last_error()
+            if code != ERROR_MORE_DATA:  # message longer than the buffer
+                self._free.append(req)
+                raise _error(code)
+        return req, req.nbytes.value
+
+    def release(self, req: _Request):
+        """Hand back a request taken by :py:meth:`complete` for reuse"""
+        self._free.append(req)
+
+    def drain(self):
+        """Wait for all the outstanding requests to complete"""
+        while self._pending:
+            self.release(self.complete()[0])
+
+    def cancel(self):
+        """Cancel the outstanding requests and wait until the system is done
+        with their buffers"""
+        for req in self._pending:
+            self.kernel32.CancelIoEx(self.handle, ctypes.byref(req.ov))
+        while self._pending:
+            req = self._pending.popleft()
+            self.kernel32.GetOverlappedResult(
+                self.handle, ctypes.byref(req.ov), ctypes.byref(req.nbytes), True
+            )
+            self._free.append(req)
+
+    def close(self):
+        """Cancel the outstanding requests and free the events"""
+        self.cancel()
+        while self._free:
+            self.kernel32.CloseHandle(self._free.pop().ov.hEvent)
+
+
+class OverlappedRawIO(ExactReadMixin, io.RawIOBase):
+    """Raw I/O stream layer over a Windows pipe handle with overlapped I/O
+
+    :param handle: pipe handle created with ``FILE_FLAG_OVERLAPPED``
+    :param rd: True if the stream is readable
+    :param wr: True if the stream is writable
+    :param depth: number of outstanding requests in each direction
+    :param size: buffer size of each request in bytes
+
+    Reads are kept ``depth`` requests ahead of the consumer, so the pipe is
+    drained while the data of the completed requests is processed. Writes
+    are copied into request buffers and return once issued; an error of a
+    write is raised by a later ``write()``, ``flush()``, or ``close()``, and
+    ``flush()`` waits until all the writes complete.
+    """
+
+    def __init__(
+        self,
+        handle: PyHANDLE,
+        rd: bool,
+        wr: bool,
+        depth: int,
+        size: int = OVERLAPPED_SIZE,
+    ):
+        super().__init__()
+        self.kernel32 = _kernel32()
+        self.handle = handle  # Underlying Windows handle.
+        self._readable = rd
+        self._writable = wr
+        self._reads: Optional[OverlappedQueue] = None
+        self._writes: Optional[OverlappedQueue] = None
+        if rd:
+            self._reads = OverlappedQueue(handle, depth, size)
+        if wr:
+            try:
+                self._writes = OverlappedQueue(handle, depth, size)
+            except BaseException:
+                if self._reads is not None:
+                    self._reads.close()
+                raise
+        self._req: Optional[_Request] = None  # completed read being consumed
+        self._data = memoryview(b"")  # its unread data
+        self._eof = False  # the writer has closed the pipe
+
+    def readable(self) -> bool:
+        """True if file was opened in a read mode."""
+        return self._readable
+
+    def seekable(self) -> bool:
+        """Always returns False (pipes are not seekable)."""
+        return False
+
+    def writable(self) -> bool:
+        """True if file was opened in a write mode."""
+        return self._writable
+
+    def _next_read(self) -> bool:
+        """top up the outstanding reads and take the oldest completed one
+
+        :return: False at EOF
+        """
+        reads = self._reads
+        if self._req is not None:
+            reads.release(self._req)
+            self._req = None
+            self._data = memoryview(b"")
+        while True:
+            try:
+                while not self._eof and reads.submit_read():
+                    pass
+            except BrokenPipeError:
+                self._eof = True  # the outstanding reads may still have data
+            if not reads.pending:
+                return False
+            try:
+                req, n = reads.complete()
+            except BrokenPipeError:
+                self._eof = True
+                reads.cancel()
+                return False
+            if n:
+                self._req = req
+                self._data = req.view[:n]
+                return True
+            reads.release(req)  # zero-length write by the client
+
+    def readinto(self, b) -> int:
+        """Read bytes into a pre-allocated, writable bytes-like object ``b`` and
+        return the number of bytes read. For example, ``b`` might be a ``bytearray``."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not self._readable:
+            raise io.UnsupportedOperation("File not open for reading")
+        with memoryview(b) as view, view.cast("B") as out:
+            if not self._data and not self._next_read():
+                return 0
+            n = min(len(out), len(self._data))
+            out[:n] = self._data[:n]
+            self._data = self._data[n:]
+        return n
+
+    def write(self, b) -> int:
+        """Write buffer ``b`` to file, return number of bytes written.
+
+        Copies up to the request size of ``b`` and issues it without waiting
+        for the reader, unless all the requests are outstanding."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not self._writable:
+            raise io.UnsupportedOperation("File not open for writing")
+        with memoryview(b) as view, view.cast("B") as mv:
+            return self._writes.submit_write(mv)
+
+    def flush(self):
+        """Wait until all the issued writes complete"""
+        super().flush()
+        if self._writes is not None:
+            self._writes.drain()
+
+    def close(self) -> None:
+        """Close the pipe.
+
+        Waits for the issued writes and cancels the outstanding reads. A
+        closed pipe cannot be used for further I/O operations. ``close()`` may
+        be called more than once without error."""
+        if self.closed:
+            return
+        try:
+            super().close()  # flush
+        finally:
+            if self._req is not None:
+                self._reads.release(self._req)
+                self._req = None
+            self._data = memoryview(b"")
+            for q in (self._reads, self._writes):
+                if q is not None:
+                    q.close()
+            if self.handle is not None:
+                self.kernel32.CloseHandle(self.handle)
+                self.handle = PyHANDLE(INVALID_HANDLE_VALUE)
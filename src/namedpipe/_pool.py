@@ -0,0 +1,139 @@
+import threading, time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from ._posix import NPopen, _FifoMan
+
+
+class _PooledNPopen(NPopen):
+    """NPopen over a FIFO borrowed from PipePool"""
+
+    def __init__(self, pool: "PipePool", fifo: str, *args, **kwargs):
+        self._pool = pool
+        self._fifo = fifo
+        super().__init__(*args, **kwargs)
+
+    def _make_fifo(self, name: Optional[str], duplex: bool = False) -> str:
+        if duplex:
+            raise ValueError("pooled pipes cannot be duplex ('+' mode)")
+        return self._fifo
+
+    def _release_fifo(self):
+        # return FIFO to the pool only once
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool._release(self._path)
+
+
+class PipePool:
+    """Pool of pre-created FIFOs, recycled by the NPopen objects it hands out
+
+    :param min_size: number of FIFOs created up front and always kept, defaults to 0
+    :param max_size: maximum number of idle FIFOs kept for reuse, defaults to unlimited
+    :param idle_timeout: seconds an idle FIFO in excess of ``min_size`` is kept
+                         before it is deleted, defaults to 60. None to keep forever.
+
+    :py:meth:`acquire` takes the same arguments as :py:class:`NPopen` (except
+    ``name``) and returns an ``NPopen`` object. Closing the object returns its
+    FIFO to the pool without deleting it, so the same path may be handed out
+    again. The pool itself is a context manager, and :py:meth:`close` deletes
+    all idle FIFOs.
+
+    .. code-block:: python
+
+       with PipePool(min_size=4) as pool:
+           for job in jobs:
+               with pool.acquire('r') as pipe:
+                   proc = sp.Popen(['ffmpeg', ..., pipe.path])
+                   stream = pipe.wait()
+                   ...
+
+    A client still holding the path of a returned FIFO connects to the next
+    pipe using it, so make sure the client is done before closing the pipe.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 0,
+        max_size: Optional[int] = None,
+        idle_timeout: Optional[float] = 60.0,
+    ):
+        if min_size < 0:
+            raise ValueError("min_size must be non-negative")
+        if max_size is not None and max_size < min_size:
+            raise ValueError("max_size must not be less than min_size")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: Deque[Tuple[str, float]] = deque()  # (path, release time)
+        self._closed = False
+
+        now = time.monotonic()
+        for _ in range(min_size):
+            self._idle.append((_FifoMan().make(None), now))
+
+    def __len__(self) -> int:
+        """number of idle FIFOs"""
+        return len(self._idle)
+
+    def acquire(self, mode: Optional[str] = "r", *args, **kwargs) -> NPopen:
+        """Get a named pipe with a pooled FIFO
+
+        Arguments are the same as ``NPopen``, except for ``name``.
+        """
+
+        if "name" in kwargs:
+            raise TypeError("pooled pipe cannot be named")
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("pool has already been closed.")
+            self._evict(time.monotonic())
+            fifo = self._idle.pop()[0] if self._idle else None
+
+        if fifo is None:
+            fifo = _FifoMan().make(None)
+
+        try:
+            return _PooledNPopen(self, fifo, mode, *args, **kwargs)
+        except:
+            self._release(fifo)
+            raise
+
+    def _release(self, fifo: str):
+        with self._lock:
+            if not self._closed and (
+                self.max_size is None or len(self._idle) < self.max_size
+            ):
+                now = time.monotonic()
+                self._idle.append((fifo, now))
+                self._evict(now)
+                return
+        _FifoMan().unlink(fifo)
+
+    def _evict(self, now: float):
+        """delete FIFOs idled longer than idle_timeout (lock must be held)"""
+        if self.idle_timeout is None:
+            return
+        expire = now - self.idle_timeout
+        while len(self._idle) > self.min_size and self._idle[0][1] < expire:
+            _FifoMan().unlink(self._idle.popleft()[0])
+
+    def close(self):
+        """Delete all idle FIFOs
+
+        Pipes still in use delete their FIFOs when they are closed.
+        """
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                _FifoMan().unlink(self._idle.popleft()[0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+        return False
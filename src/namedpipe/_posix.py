@@ -1,58 +1,406 @@
-import os, tempfile
+import errno, fcntl, io, itertools, os, stat, sys, threading, time
 from os import path
-from typing import IO, Optional, Union
+from typing import IO, Callable, Iterator, Literal, Optional, Union
+
+from ._rawio import ExactReadMixin
+from ._stats import PipeStats, StatsRawIO
+
+
+# default size of read-ahead buffers (default Linux pipe size)
+_READAHEAD_SIZE = 1 << 16
+
+# default size of write-behind chunks combining small writes
+_COALESCE_SIZE = 1 << 16
+
+# upper bound of the polling interval used while waiting for a reader to
+# connect to a write-only FIFO (there is no readiness event for that)
+_POLL_MAX = 0.05
+
+# Linux-only fcntl commands to resize kernel pipe buffer (fcntl module has them since py3.10)
+if sys.platform.startswith("linux"):
+    _F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+    _F_GETPIPE_SZ = getattr(fcntl, "F_GETPIPE_SZ", 1032)
+else:
+    _F_SETPIPE_SZ = _F_GETPIPE_SZ = None
+
+
+def _pipe_max_size() -> Optional[int]:
+    """maximum pipe size an unprivileged process may set (Linux only)"""
+    try:
+        with open("/proc/sys/fs/pipe-max-size") as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _set_pipe_size(fd: int, size: int) -> int:
+    """set kernel buffer size of the pipe
+
+    :param fd: file descriptor of the pipe
+    :param size: requested size in bytes, capped at ``/proc/sys/fs/pipe-max-size``
+    :return: effective pipe size (the kernel rounds up to a power-of-2 pages)
+    """
+    max_size = _pipe_max_size()
+    if max_size is not None:
+        size = min(size, max_size)
+    return fcntl.fcntl(fd, _F_SETPIPE_SZ, size)
+
+
+class PipeRawIO(ExactReadMixin, io.FileIO):
+    """Unbuffered FIFO stream with full-length read methods"""
+
+
+def _wrap_raw(
+    raw: io.RawIOBase,
+    mode: str,
+    buffering: int,
+    encoding: Optional[str],
+    errors: Optional[str],
+    newline: Optional[str],
+    writebehind: int = 0,
+) -> IO:
+    """stack buffer and text layers over a raw stream as open() does
+
+    If writebehind > 0, WriteBehindIO replaces the buffer layer.
+    """
+
+    text = "t" in mode
+    line_buffering = text and buffering == 1
+    if writebehind:
+        from ._writebehind import WriteBehindIO
+
+        stream = WriteBehindIO(
+            raw, writebehind, buffering if buffering > 1 else _COALESCE_SIZE
+        )
+        return (
+            io.TextIOWrapper(stream, encoding, errors, newline, line_buffering)
+            if text
+            else stream
+        )
+
+    if buffering < 0 or line_buffering:
+        buffering = io.DEFAULT_BUFFER_SIZE
+    if buffering == 0:
+        if text:
+            raise ValueError("can't have unbuffered text I/O")
+        return raw
+
+    if "+" in mode:
+        stream = io.BufferedRWPair(raw, raw, buffering)  # not seekable
+    elif "r" in mode:
+        stream = io.BufferedReader(raw, buffering)
+    else:
+        stream = io.BufferedWriter(raw, buffering)
+
+    return (
+        io.TextIOWrapper(stream, encoding, errors, newline, line_buffering)
+        if text
+        else stream
+    )
+
+
+def _try_open_nonblock(name: str, flags: int) -> Optional[int]:
+    """open FIFO in non-blocking mode
+
+    :return: file descriptor or None if no reader is connected to a write-only FIFO
+    """
+    try:
+        return os.open(name, flags | os.O_NONBLOCK)
+    except OSError as e:
+        if e.errno == errno.ENXIO:
+            return None
+        raise
+
+
+# maximum number of bytes moved per system call by NPopen.pump_to()/pump_from()
+_PUMP_CHUNK = 1 << 20
+
+
+def _as_fd(obj) -> int:
+    """get file descriptor of a file object (flushed) or pass through an int"""
+    if isinstance(obj, int):
+        return obj
+    if hasattr(obj, "flush"):
+        obj.flush()
+    return obj.fileno()
+
+
+def _flush_all(stream: IO):
+    """flush stream and wait for write-behind thread to write everything"""
+    drain = getattr(stream, "drain", None)  # WriteBehindIO
+    if drain is None:
+        stream.flush()
+    else:
+        drain()
+
+
+def _write_all(fd: int, b) -> None:
+    with memoryview(b) as mv:
+        while mv:
+            mv = mv[os.write(fd, mv) :]
+
+
+# maximum number of buffers per os.writev() call
 try:
-    from typing import Literal  # type: ignore
-except ImportError:
-    from typing_extensions import Literal
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+
+def _writev_all(fd: int, buffers) -> int:
+    """write all buffers with os.writev(), resuming after partial writes
+
+    :return: total number of bytes written
+    """
+    views = [mv for mv in (memoryview(b).cast("B") for b in buffers) if len(mv)]
+    total = 0
+    i = 0
+    while i < len(views):
+        n = os.writev(fd, views[i : i + _IOV_MAX])
+        total += n
+        # skip fully written buffers and trim the partially written one
+        while i < len(views) and n >= len(views[i]):
+            n -= len(views[i])
+            i += 1
+        if n:
+            views[i] = views[i][n:]
+    return total
+
+
+def _pump(fd_in: int, fd_out: int, nbytes: Optional[int], sendfile: bool) -> int:
+    """move data from fd_in to fd_out until EOF or nbytes are moved
+
+    Tries zero-copy ``os.splice()`` (Linux, py3.10+) and, if ``sendfile`` is
+    True, ``os.sendfile()`` (Linux) before falling back to read/write via a
+    reused buffer.
+
+    :return: number of bytes moved
+    """
+
+    buf = None
+
+    def copy(count):
+        nonlocal buf
+        if buf is None:
+            buf = bytearray(_PUMP_CHUNK)
+        with memoryview(buf)[:count] as mv:
+            n = os.readv(fd_in, [mv])
+            _write_all(fd_out, mv[:n])
+        return n
+
+    methods = []
+    if hasattr(os, "splice"):
+        methods.append(lambda count: os.splice(fd_in, fd_out, count))
+    if sendfile and sys.platform.startswith("linux") and hasattr(os, "sendfile"):
+        methods.append(lambda count: os.sendfile(fd_out, fd_in, None, count))
+    methods.append(copy)
+
+    move = methods.pop(0)
+    total = 0
+    while nbytes is None or total < nbytes:
+        count = _PUMP_CHUNK if nbytes is None else min(_PUMP_CHUNK, nbytes - total)
+        try:
+            n = move(count)
+        except OSError as e:
+            # unsupported file types are only reported by the first call
+            if total or not methods or e.errno not in (errno.EINVAL, errno.ENOSYS):
+                raise
+            move = methods.pop(0)
+            continue
+        if not n:
+            break
+        total += n
+    return total
+
+
+def _drain_buffer(stream, fd_out: int, nbytes: Optional[int]) -> int:
+    """write data held in the buffer of BufferedReader to fd_out
+
+    read1() returns only the buffered bytes if any, and an empty buffer
+    stays empty, so the rest of the data can be moved via the file
+    descriptor.
+
+    :return: number of bytes written (0 at EOF)
+    """
+    if not isinstance(stream, io.BufferedReader) or nbytes == 0:
+        return 0
+    b = stream.read1(-1 if nbytes is None else nbytes)
+    _write_all(fd_out, b)
+    return len(b)
+
+
+def _tempdir_pid(name: str) -> Optional[int]:
+    """pid of the process which created a pipe directory ("pipe<pid>-*")"""
+    prefix, sep, _ = name.partition("-")
+    if sep and prefix.startswith("pipe") and prefix[4:].isdigit():
+        return int(prefix[4:])
+    return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by another user
+    return True
+
+
+def _remove_stale_tempdirs(base_dir: str) -> int:
+    """remove pipe directories (and their FIFOs and sockets) left by dead processes
+
+    :return: number of directories removed
+    """
+    uid = os.getuid()
+    nremoved = 0
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            pid = _tempdir_pid(entry.name)
+            if pid is None or pid == os.getpid() or _pid_alive(pid):
+                continue
+            try:
+                if (
+                    not entry.is_dir(follow_symlinks=False)
+                    or entry.stat(follow_symlinks=False).st_uid != uid
+                ):
+                    continue
+                with os.scandir(entry.path) as pipes:
+                    for pipe in pipes:
+                        st_mode = pipe.stat(follow_symlinks=False).st_mode
+                        if stat.S_ISFIFO(st_mode) or stat.S_ISSOCK(st_mode):
+                            os.unlink(pipe.path)  # FIFO or duplex pipe socket
+                os.rmdir(entry.path)
+            except OSError:
+                continue  # removed concurrently or holds other files
+            nremoved += 1
+    return nremoved
 
 
 class _FifoMan:
 
     __instance = None
-    __inited = False
+    __lock = threading.Lock()  # guards the singleton creation
+
+    # settings of configure(), kept across fork
+    base_dir: Optional[str] = None  # None for the default temporary directory
+    keep = False  # True to keep tempdir until exit
 
     def __new__(cls) -> "_FifoMan":
         if cls.__instance is None:
-            cls.__instance = super().__new__(cls)
+            with cls.__lock:
+                if cls.__instance is None:
+                    self = super().__new__(cls)
+                    self._reset()
+                    cls.__instance = self
         return cls.__instance
 
-    def __init__(self) -> None:
-        if type(self).__inited:
-            return
-        type(self).__inited = True
-
+    def _reset(self) -> None:
+        self._lock = threading.Lock()  # guards tempdir and active
         self.tempdir = None
-        self.id = 0
+        self._ids = itertools.count()  # next() is atomic, no lock needed
         self.active = 0  # if zero, no tempdir
 
-    def make(self, name):
-        in_dir = not (name and path.isabs(name))
-        if in_dir:
+    @classmethod
+    def _after_fork(cls) -> None:
+        # child starts with fresh state and leaves the parent's tempdir alone
+        cls.__lock = threading.Lock()
+        if cls.__instance is not None:
+            cls.__instance._reset()
+
+    def make(self, name, create: Callable[[str], None] = os.mkfifo):
+        if name and path.isabs(name):
+            create(name)
+            return name
+
+        # reserve the tempdir before creating the FIFO in it
+        with self._lock:
             if not self.tempdir:
-                self.tempdir = tempfile.mkdtemp(prefix="pipe", suffix="")
-            name = path.join(self.tempdir, str(self.id))
+                import tempfile  # deferred, pulls in random and shutil
+
+                self.tempdir = tempfile.mkdtemp(
+                    prefix=f"pipe{os.getpid()}-", dir=self.base_dir
+                )
+            self.active += 1
+            tempdir = self.tempdir
+
+        name = path.join(tempdir, str(next(self._ids)))
         try:
-            os.mkfifo(name)
+            create(name)
         except:
-            if in_dir and not self.active:
-                os.rmdir(self.tempdir)
+            with self._lock:
+                self._release_tempdir()
             raise
 
-        if in_dir:
-            # if success, update the counter
-            self.id += 1
-            self.active += 1
-
         return name
 
     def unlink(self, name):
         os.unlink(name)
-        if self.tempdir and name.startswith(self.tempdir):
-            self.active -= 1
-            if not self.active:
+        with self._lock:
+            if self.tempdir and path.dirname(name) == self.tempdir:
+                self._release_tempdir()
+
+    def _release_tempdir(self):
+        # lock must be held
+        self.active -= 1
+        if not self.active and not self.keep:
+            os.rmdir(self.tempdir)
+            self.tempdir = None
+
+    def configure(self, base_dir: Optional[str], keep: bool) -> None:
+        with self._lock:
+            if self.active:
+                raise RuntimeError("cannot configure while pipes are open.")
+            if self.tempdir:  # kept from the previous configuration
                 os.rmdir(self.tempdir)
                 self.tempdir = None
+            type(self).base_dir = base_dir
+            if keep and not type(self).keep:
+                import atexit
+
+                atexit.register(self._remove_kept)
+            type(self).keep = keep
+
+    def _remove_kept(self) -> None:
+        with self._lock:
+            if self.tempdir and not self.active:
+                os.rmdir(self.tempdir)
+                self.tempdir = None
+
+
+os.register_at_fork(after_in_child=_FifoMan._after_fork)
+
+
+def configure(
+    dir: Optional[str] = None, keep: bool = False, clean_stale: bool = True
+) -> int:
+    """Configure the directory of the POSIX named pipes
+
+    :param dir: base directory, in which each process creates its pipe
+                directory ``pipe<pid>-*``, e.g., a tmpfs such as ``/dev/shm`` or
+                a service runtime directory. Defaults to ``$TMPDIR``.
+    :param keep: True to keep the pipe directory until the process exits,
+                 instead of removing it whenever its last pipe is closed
+    :param clean_stale: True to remove pipe directories (and the FIFOs and
+                        sockets in them) left in the base directory by
+                        processes which no longer exist, e.g., crashed workers
+    :return: number of stale pipe directories removed
+
+    Call it at startup, before creating pipes. Pipes with an absolute ``name``
+    are not affected.
+    """
+    if dir is not None and not path.isdir(dir):
+        raise NotADirectoryError(f"{dir!r} is not a directory.")
+    _FifoMan().configure(dir, keep)
+    if not clean_stale:
+        return 0
+    if dir is None:
+        import tempfile
+
+        dir = tempfile.gettempdir()
+    return _remove_stale_tempdirs(dir)
 
 
 class NPopen:
@@ -64,10 +412,39 @@ class NPopen:
         errors: Optional[str] = None,
         newline: Optional[Literal["", "\n", "\r", "\r\n"]] = None,
         name: Optional[str] = None,
+        pipe_size: Optional[int] = None,
+        stats: Union[bool, Callable[[str, int, float], None]] = False,
+        readahead: int = 0,
+        writebehind: int = 0,
     ):
+        if pipe_size is not None and pipe_size <= 0:
+            raise ValueError("pipe_size must be a positive integer")
+        if readahead < 0:
+            raise ValueError("readahead must be a non-negative integer")
+        if readahead and any(c in mode for c in "wxa+"):
+            raise ValueError("readahead requires a read-only mode")
+        if writebehind < 0:
+            raise ValueError("writebehind must be a non-negative integer")
+        if writebehind and any(c in mode for c in "r+"):
+            raise ValueError("writebehind requires a write-only mode")
+        if "t" in mode and bufsize == 0:
+            raise ValueError("can't have unbuffered text I/O")
+
         # "open" named pipe
-        self._path = _FifoMan().make(name)
+        self._listener = None  # listening socket of a duplex pipe
+        self._closed = False
+        self._path = self._make_fifo(name, "+" in mode)
         self.stream: Union[IO, None] = None  # I/O stream of the pipe
+        self._transport = None  # asyncio transport if opened by wait_async()
+        self._waiting = False  # True while wait() is blocked
+        self._abort = None  # exception type to raise from aborted wait()
+        self._wait_lock = threading.Lock()
+        self._pipe_size = pipe_size  # requested kernel pipe buffer size
+        self._stats = (
+            None if stats is False else PipeStats(None if stats is True else stats)
+        )
+        self._readahead = readahead  # number of read-ahead buffers
+        self._writebehind = writebehind  # high-water mark of write-behind queue
 
         if 't' not in mode and 'b' not in mode:
             mode += 'b' # default to binary mode
@@ -84,25 +461,403 @@ class NPopen:
     def path(self):
         return self._path
 
+    @property
+    def stats(self) -> Optional[PipeStats]:
+        """PipeStats|None: I/O statistics if instrumented by the ``stats`` argument"""
+        return self._stats
+
+    @property
+    def pipe_size(self) -> Optional[int]:
+        """int|None: kernel buffer size of the connected pipe in bytes (Linux only)"""
+        if self.stream is None or _F_GETPIPE_SZ is None or self._listener is not None:
+            return None
+        fd = self._transport.get_extra_info("pipe") if self._transport else self.stream
+        return fcntl.fcntl(fd.fileno(), _F_GETPIPE_SZ)
+
     def __str__(self):
         # return the path
         return self._path
 
     def close(self):
-        # close named pipe
-        if self.stream is not None:
-            self.stream.close()
+        # unblock pending wait() call; a later one sees _closed
+        with self._wait_lock:
+            self._closed = True
+        self._abort_wait()
+
+        # close named pipe, deleting it even if flushing the stream fails
+        try:
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+            elif self.stream is not None:
+                self.stream.close()
+        finally:
             self.stream = None
-        if path.exists(self._path):
-            _FifoMan().unlink(self._path)
+            if self._listener is not None:
+                self._listener.close()
+                self._listener = None
+            if path.exists(self._path):
+                self._release_fifo()
+
+    def _make_fifo(self, name: Optional[str], duplex: bool = False) -> str:
+        """create FIFO (or listening Unix-domain socket if duplex) and return its path"""
+        return _FifoMan().make(name, self._listen if duplex else os.mkfifo)
+
+    def _listen(self, name: str):
+        """create Unix-domain socket listening at name"""
+        import socket
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(name)
+            sock.listen()
+        except:
+            sock.close()
+            raise
+        self._listener = sock
 
-    def wait(self):
+    def _release_fifo(self):
+        """dispose of FIFO when the pipe is closed"""
+        _FifoMan().unlink(self._path)
 
-        if self._path is None:
+    def wait(self, timeout: Optional[float] = None):
+
+        if self._closed:
             raise RuntimeError("pipe has already been closed.")
 
         # wait for the pipe to open (the other end to be opened) and return fileobj to read/write
-        self.stream = open(self._path, **self._open_args)
+        t0 = time.perf_counter()
+        fd = self._open_fifo(timeout)
+        raw = None  # outermost raw layer, which owns fd once created
+        try:
+            size = _READAHEAD_SIZE
+            if self._pipe_size is not None and _F_SETPIPE_SZ is not None:
+                if self._listener is None:
+                    size = _set_pipe_size(fd, self._pipe_size)
+            if self._stats is None and not (
+                self._readahead
+                or self._writebehind
+                or self._open_args["buffering"] == 0
+                or self._listener is not None
+            ):
+                self.stream = open(fd, **self._open_args)
+                # name the stream by the pipe path as open(path) would
+                getattr(self.stream, "buffer", self.stream).raw.name = self._path
+            else:
+                raw = PipeRawIO(fd, self._open_args["mode"].replace("t", ""))
+                raw.name = self._path
+                if self._stats is not None:
+                    self._stats.record("wait", 0, time.perf_counter() - t0)
+                    raw = StatsRawIO(raw, self._stats)
+                if self._readahead:
+                    from ._prefetch import PrefetchRawIO
+
+                    raw = PrefetchRawIO(raw, self._readahead, size)
+                self.stream = _wrap_raw(
+                    raw, **self._open_args, writebehind=self._writebehind
+                )
+        except:
+            if raw is None:
+                os.close(fd)
+            else:
+                raw.close()  # also stops the read-ahead thread
+            raise
+        return self.stream
+
+    def sessions(self, timeout: Optional[float] = None) -> Iterator[IO]:
+        """Serve successive client connections on the same path
+
+        :param timeout: seconds to wait for each client, defaults to wait
+                        indefinitely. The iteration ends if no client connects
+                        in time.
+        :return: iterator of the streams returned by :py:meth:`wait`, one per
+                 connection
+
+        The pipe is reopened for the next client without being deleted, so
+        clients can keep using the same path. The stream of a session is
+        closed when the iteration advances. The iteration ends when the pipe
+        is closed, e.g., by :py:meth:`close` from another thread.
+
+        A FIFO does not separate clients by itself: a writer which opens the
+        FIFO before the previous session reaches EOF (all writers have closed)
+        joins that session. A duplex pipe accepts each client as its own
+        session.
+
+        .. code-block:: python
+
+           with NPopen('r') as pipe:
+               for stream in pipe.sessions():
+                   handle(stream.read())
+        """
+        while not self._closed:
+            try:
+                stream = self.wait(timeout)
+            except TimeoutError:
+                return
+            except RuntimeError:
+                if self._closed:
+                    return
+                raise
+            try:
+                yield stream
+            finally:
+                if self.stream is stream:  # not closed by close()
+                    self.stream = None
+                    stream.close()
+
+    def _open_fifo(self, timeout: Optional[float]) -> int:
+        """open FIFO once the client connects
+
+        FIFO is opened in blocking mode. The open() call is aborted by
+        _abort_wait() on timeout or by close().
+
+        :return: file descriptor
+        """
+
+        with self._wait_lock:
+            # checked under the lock, so close() either precedes this or
+            # sees the pending wait and aborts it
+            if self._closed:
+                raise RuntimeError("pipe has already been closed.")
+            self._abort = None
+            self._waiting = True
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, self._abort_wait, (TimeoutError,))
+            timer.daemon = True
+            timer.start()
+        try:
+            if self._listener is None:
+                fd = os.open(self._path, os.O_RDONLY if self.readable() else os.O_WRONLY)
+            else:
+                fd = self._accept()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            with self._wait_lock:
+                self._waiting = False
+                abort = self._abort
+
+        if abort is TimeoutError:
+            os.close(fd)
+            raise TimeoutError("timed out waiting for client.")
+        if abort is not None:
+            os.close(fd)
+            raise RuntimeError("pipe was closed while waiting for client.")
+        return fd
+
+    def _accept(self) -> int:
+        """accept a client of a duplex pipe and return the connection's fd"""
+        if self._listener is None:
+            raise RuntimeError("pipe has already been closed.")
+        conn, _ = self._listener.accept()
+        if self._pipe_size is not None:
+            import socket
+
+            for opt in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+                conn.setsockopt(socket.SOL_SOCKET, opt, self._pipe_size)
+        return conn.detach()
+
+    def _abort_wait(self, reason=RuntimeError):
+        """abort pending open() in _open_fifo() by connecting a dummy client"""
+
+        with self._wait_lock:
+            if not self._waiting or self._abort is not None:
+                return
+            self._abort = reason
+
+        if self._listener is not None:
+            import socket
+
+            # dummy client connection, queued until accept() takes it
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self._path)
+            return
+
+        # dummy client of the opposite direction, repeated in case wait() is
+        # not yet blocked in open()
+        flags = (os.O_WRONLY if self.readable() else os.O_RDONLY) | os.O_NONBLOCK
+        while True:
+            with self._wait_lock:
+                if not self._waiting:
+                    return
+            try:
+                os.close(os.open(self._path, flags))
+            except OSError as e:
+                if e.errno != errno.ENXIO:  # no reader yet
+                    raise
+            time.sleep(0.001)
+
+    async def wait_async(self):
+        """Wait for client connection without blocking the asyncio event loop
+
+        The FIFO is opened with ``O_NONBLOCK``. Returns an
+        :py:class:`asyncio.StreamReader` for a read pipe or an
+        :py:class:`asyncio.StreamWriter` for a write pipe. Only the binary read
+        and write modes are supported, and the stream is buffered by asyncio,
+        so the ``bufsize``, ``stats``, ``readahead`` and ``writebehind``
+        options are rejected.
+
+        A write pipe awaits the client connection on the running loop. A read
+        pipe returns immediately, and reading from it awaits the client. (This
+        relies on Linux not reporting an unconnected FIFO as readable.)
+        """
+
+        import asyncio
+
+        if self._closed:
+            raise RuntimeError("pipe has already been closed.")
+
+        mode = self._open_args["mode"]
+        if "t" in mode or "+" in mode:
+            raise ValueError("wait_async() only supports binary read or write mode")
+        if (
+            self._open_args["buffering"] != -1
+            or self._stats is not None
+            or self._readahead
+            or self._writebehind
+        ):
+            raise ValueError(
+                "wait_async() does not support bufsize, stats, readahead or writebehind"
+            )
+
+        loop = asyncio.get_running_loop()
+
+        if self.readable():
+            fd = os.open(self._path, os.O_RDONLY | os.O_NONBLOCK)
+            try:
+                if self._pipe_size is not None and _F_SETPIPE_SZ is not None:
+                    _set_pipe_size(fd, self._pipe_size)
+                fileobj = PipeRawIO(fd, "rb")
+            except:
+                os.close(fd)
+                raise
+
+            reader = asyncio.StreamReader(loop=loop)
+            self._transport, _ = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader, loop=loop), fileobj
+            )
+            self.stream = reader
+        else:
+            # no readiness event for a reader to connect: retry with backoff
+            delay = 0.001
+            while (fd := _try_open_nonblock(self._path, os.O_WRONLY)) is None:
+                await asyncio.sleep(delay)
+                delay = min(2 * delay, _POLL_MAX)
+            try:
+                if self._pipe_size is not None and _F_SETPIPE_SZ is not None:
+                    _set_pipe_size(fd, self._pipe_size)
+                fileobj = open(fd, "wb", buffering=0)
+            except:
+                os.close(fd)
+                raise
+
+            self._transport, protocol = await loop.connect_write_pipe(
+                lambda: asyncio.StreamReaderProtocol(
+                    asyncio.StreamReader(loop=loop), loop=loop
+                ),
+                fileobj,
+            )
+            self.stream = asyncio.StreamWriter(self._transport, protocol, None, loop)
+
+        return self.stream
+
+    def pump_to(self, dst, nbytes: Optional[int] = None) -> int:
+        """Forward data from the pipe to a file or socket
+
+        :param dst: file descriptor or file object with ``fileno()``
+        :param nbytes: number of bytes to forward, defaults to all until EOF
+        :return: number of bytes forwarded
+
+        On Linux, the data is moved by ``os.splice()`` without copying it into
+        Python. Otherwise, it falls back to read/write through a reused buffer.
+        The pipe must be connected in a binary read mode without ``readahead``.
+        """
+        stream = self._binary_stream(self.readable())
+        fd_out = _as_fd(dst)
+        n = _drain_buffer(stream, fd_out, nbytes)
+        if n == 0 and nbytes != 0 and isinstance(stream, io.BufferedReader):
+            return 0  # EOF
+        if nbytes is not None:
+            nbytes -= n
+        return n + self._pump(stream.fileno(), fd_out, nbytes, "read")
+
+    def pump_from(self, src, nbytes: Optional[int] = None) -> int:
+        """Forward data from a file or socket to the pipe
+
+        :param src: file descriptor or file object with ``fileno()``
+        :param nbytes: number of bytes to forward, defaults to all until EOF
+        :return: number of bytes forwarded
+
+        On Linux, the data is moved by ``os.splice()`` or ``os.sendfile()``
+        without copying it into Python. Otherwise, it falls back to read/write
+        through a reused buffer. The pipe must be connected in a binary write
+        mode.
+        """
+        stream = self._binary_stream(self.writable())
+        _flush_all(stream)
+        fd_out = stream.fileno()
+        n = _drain_buffer(src, fd_out, nbytes)
+        if n == 0 and nbytes != 0 and isinstance(src, io.BufferedReader):
+            return 0  # EOF
+        if nbytes is not None:
+            nbytes -= n
+        return n + self._pump(_as_fd(src), fd_out, nbytes, "write")
+
+    def _pump(self, fd_in: int, fd_out: int, nbytes: Optional[int], op: str) -> int:
+        t0 = time.perf_counter()
+        n = _pump(fd_in, fd_out, nbytes, op == "write")
+        if self._stats is not None:
+            self._stats.record(op, n, time.perf_counter() - t0)
+        return n
+
+    def writev(self, buffers) -> int:
+        """Write a sequence of bytes-like objects to the pipe
+
+        :param buffers: sequence of bytes-like objects, e.g., planes of a frame
+        :return: number of bytes written
+
+        Flushes the stream and writes all the buffers with ``os.writev()``
+        without concatenating them, repeating the call on partial writes. The
+        pipe must be connected in a binary write mode.
+        """
+        stream = self._binary_stream(self.writable())
+        _flush_all(stream)
+        t0 = time.perf_counter()
+        n = _writev_all(stream.fileno(), buffers)
+        if self._stats is not None:
+            self._stats.record("write", n, time.perf_counter() - t0)
+        return n
+
+    def _open_nonblock(self) -> IO:
+        """open read pipe in non-blocking mode without waiting for the client
+
+        :return: unbuffered binary stream, also set to ``NPopen.stream``
+        """
+        if self._closed:
+            raise RuntimeError("pipe has already been closed.")
+        if not self.readable() or self.writable():
+            raise ValueError("pipe must be read-only.")
+
+        fd = os.open(self._path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            if self._pipe_size is not None and _F_SETPIPE_SZ is not None:
+                _set_pipe_size(fd, self._pipe_size)
+            self.stream = PipeRawIO(fd, "rb")
+        except:
+            os.close(fd)
+            raise
+        return self.stream
+
+    def _binary_stream(self, mode_ok: bool) -> IO:
+        """return connected binary stream for direct file descriptor access"""
+        if self.stream is None:
+            raise RuntimeError("pipe is not connected.")
+        if not mode_ok or not isinstance(self.stream, (io.RawIOBase, io.BufferedIOBase)):
+            raise ValueError("operation not supported by the pipe mode.")
+        if self._readahead:
+            # the read-ahead thread reads the fd and holds data in its queue
+            raise ValueError("operation not supported with readahead.")
         return self.stream
 
     def __bool__(self):
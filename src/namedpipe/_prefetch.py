@@ -0,0 +1,106 @@
+import io, queue, threading
+from typing import Optional, Tuple, Union
+
+from ._rawio import ExactReadMixin
+
+
+class PrefetchRawIO(ExactReadMixin, io.RawIOBase):
+    """Raw I/O layer reading ahead from another raw stream in a background thread
+
+    :param raw: readable raw stream to be wrapped
+    :param nbuffers: number of preallocated buffers to fill ahead
+    :param buffer_size: size of each buffer in bytes
+
+    The reader thread keeps filling the free buffers as long as the raw stream
+    yields data, so the writer on the other end of the pipe is not blocked
+    while the consumer is busy. Once all the buffers are filled, the thread
+    waits for the consumer to read them (backpressure).
+    """
+
+    def __init__(self, raw: io.RawIOBase, nbuffers: int, buffer_size: int):
+        if nbuffers <= 0:
+            raise ValueError("nbuffers must be a positive integer")
+        super().__init__()
+        self.raw = raw
+        self._free: "queue.SimpleQueue[Optional[bytearray]]" = queue.SimpleQueue()
+        self._filled: "queue.SimpleQueue[Union[Tuple[bytearray, int], BaseException]]" = (
+            queue.SimpleQueue()
+        )
+        for _ in range(nbuffers):
+            self._free.put(bytearray(buffer_size))
+        self._current: Optional[Tuple[bytearray, int, int]] = None  # (buf, pos, end)
+        self._eof = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while (buf := self._free.get()) is not None:
+                n = self.raw.readinto(buf) or 0
+                self._filled.put((buf, n))
+                if not n:
+                    break
+        except BaseException as e:
+            self._filled.put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def fileno(self) -> int:
+        return self.raw.fileno()
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    def close(self):
+        if self.closed:
+            return
+        self._free.put(None)  # stop reader thread after its current read
+        try:
+            self.raw.close()
+        finally:
+            super().close()
+
+    def _next(self, block: bool) -> bool:
+        """get next filled buffer, return False if none"""
+        if self._eof:
+            return False
+        try:
+            item = self._filled.get(block)
+        except queue.Empty:
+            return False
+        if isinstance(item, BaseException):
+            self._eof = True
+            raise item
+        buf, n = item
+        if not n:
+            self._eof = True
+            return False
+        self._current = (buf, 0, n)
+        return True
+
+    def readinto(self, b) -> int:
+        self._checkClosed()
+        with memoryview(b) as mv, mv.cast("B") as out:
+            size = len(out)
+            nread = 0
+            # block only for the first buffer, then take whatever is ready
+            while nread < size and (
+                self._current is not None or self._next(block=not nread)
+            ):
+                buf, pos, end = self._current
+                n = min(size - nread, end - pos)
+                with memoryview(buf) as src:
+                    out[nread : nread + n] = src[pos : pos + n]
+                nread += n
+                pos += n
+                if pos < end:
+                    self._current = (buf, pos, end)
+                else:
+                    self._current = None
+                    self._free.put(buf)
+            return nread
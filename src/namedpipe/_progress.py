@@ -0,0 +1,112 @@
+import io
+from typing import IO, Dict, Iterable, Iterator, Optional
+
+
+class ProgressReader:
+    """Parse ``key=value`` progress blocks such as ffmpeg's ``-progress`` output
+
+    :param stream: stream to read from, e.g., ``NPopen.stream``. A text stream
+                   is read through its underlying binary buffer.
+    :param keys: keys to keep, defaults to all. ``'progress'`` is always kept.
+                 Only the lines of these keys are located and parsed.
+    :param encoding: text encoding of the stream, defaults to ``'utf-8'``
+    :param errors: how decoding errors are handled, defaults to ``'replace'``
+    :param chunk_size: number of bytes read at a time, defaults to 64 KiB
+
+    Each block is a run of ``key=value`` lines terminated by a ``progress``
+    line (``progress=continue`` or ``progress=end`` from ffmpeg). The stream
+    is read in large binary chunks, whose complete lines are decoded and
+    split in bulk, instead of being decoded line by line. If ``keys`` are
+    given, the other lines are not parsed at all; their keys must then start
+    the line and be followed directly by ``=``, as ffmpeg writes them.
+
+    .. code-block:: python
+
+       with NPopen('r') as pipe:
+           proc = sp.Popen(['ffmpeg', '-progress', pipe.path, ...])
+           for block in ProgressReader(pipe.wait(), keys=['out_time_us']):
+               print(block['out_time_us'])
+    """
+
+    def __init__(
+        self,
+        stream: IO,
+        keys: Optional[Iterable[str]] = None,
+        encoding: str = "utf-8",
+        errors: str = "replace",
+        chunk_size: int = 1 << 16,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        if isinstance(stream, io.TextIOBase):
+            stream = stream.buffer
+        self.stream = stream
+        self.keys = None if keys is None else frozenset(keys) | {"progress"}
+        self.encoding = encoding
+        self.errors = errors
+        self.chunk_size = chunk_size
+        self._blocks = self._parse()
+
+    def _texts(self) -> Iterator[str]:
+        """yield decoded text of the stream, chunk by chunk and in whole lines"""
+        read = getattr(self.stream, "read1", self.stream.read)
+        tail = b""
+        while chunk := read(self.chunk_size):
+            end = chunk.rfind(b"\n") + 1
+            if not end:
+                tail += chunk
+                continue
+            data = tail + chunk[:end] if tail else chunk[:end]
+            tail = chunk[end:]
+            yield data.decode(self.encoding, self.errors)
+        if tail:
+            yield tail.decode(self.encoding, self.errors) + "\n"
+
+    def _parse(self) -> Iterator[Dict[str, str]]:
+        if self.keys is None:
+            return self._parse_all()
+        return self._parse_keys()
+
+    def _parse_all(self) -> Iterator[Dict[str, str]]:
+        block = {}
+        for text in self._texts():
+            for line in text.split("\n"):
+                key, sep, value = line.partition("=")
+                if not sep:
+                    continue
+                key = key.strip()
+                block[key] = value.strip()
+                if key == "progress":
+                    yield block
+                    block = {}
+
+    def _parse_keys(self) -> Iterator[Dict[str, str]]:
+        # look up only the wanted "key=" lines of each block instead of
+        # splitting all of them
+        needles = [(key, f"\n{key}=") for key in self.keys if key != "progress"]
+        text = "\n"  # block start is always preceded by a newline
+        for chunk in self._texts():
+            text += chunk
+            pos = 0  # newline before the current block
+            while (end := text.find("\nprogress=", pos)) >= 0:
+                block = {}
+                for key, needle in needles:
+                    i = text.find(needle, pos, end + 1)
+                    if i >= 0:
+                        i += len(needle)
+                        block[key] = text[i : text.find("\n", i)].strip()
+                pos = text.find("\n", end + 1)
+                block["progress"] = text[end + 10 : pos].strip()
+                yield block
+            text = text[pos:]
+
+    def read(self) -> Optional[Dict[str, str]]:
+        """Read next progress block
+
+        :return: dict of the block's key-value pairs or None at EOF. An
+                 incomplete block at EOF (no ``progress`` line) is dropped.
+        """
+        return next(self._blocks, None)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return self._blocks
@@ -0,0 +1,35 @@
+class ExactReadMixin:
+    """Full-length reads for raw I/O classes, which may return short"""
+
+    def readinto_exact(self, b) -> int:
+        """Read bytes into a pre-allocated, writable bytes-like object ``b`` until
+        it is filled, repeating the reads as needed.
+
+        :return: number of bytes read, less than the size of ``b`` only at EOF
+        """
+        with memoryview(b) as mv, mv.cast("B") as out:
+            size = len(out)
+            nread = 0
+            while nread < size:
+                n = self.readinto(out[nread:])
+                if not n:
+                    break
+                nread += n
+            return nread
+
+    def readexactly(self, n: int) -> bytes:
+        """Read exactly ``n`` bytes
+
+        :raises EOFError: if the stream reaches EOF before ``n`` bytes are read
+        """
+        data = self.read(n)  # mostly complete in one system call
+        if data is None:
+            data = b""
+        if len(data) == n:
+            return data
+        buf = bytearray(n)
+        buf[: len(data)] = data
+        nread = len(data) + self.readinto_exact(memoryview(buf)[len(data) :])
+        if nread < n:
+            raise EOFError(f"expected {n} bytes but got {nread} bytes before EOF")
+        return bytes(buf)
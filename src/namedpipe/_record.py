@@ -0,0 +1,193 @@
+import struct
+from typing import IO, Iterable, Iterator, Optional
+
+# record header: payload length
+_HEADER = struct.Struct("<I")
+
+
+def _nbytes(record) -> int:
+    if isinstance(record, (bytes, bytearray)):
+        n = len(record)
+    else:
+        with memoryview(record) as mv:
+            n = mv.nbytes
+    if n > 0xFFFFFFFF:
+        raise ValueError("record is larger than 4 GiB.")
+    return n
+
+
+def _write_full(stream: IO, b):
+    """write whole buffer, looping over short writes of raw streams"""
+    n = stream.write(b)
+    if n < len(b):
+        with memoryview(b) as mv:
+            while n < len(mv):
+                n += stream.write(mv[n:])
+
+
+class RecordWriter:
+    """Write length-prefixed records to a binary stream
+
+    :param stream: binary stream to write to, e.g., ``NPopen.stream``
+
+    Each record is a 4-byte little-endian length followed by the payload.
+    The header and the payload are assembled in one buffer and issued as one
+    write, and :py:meth:`writemany` batches any number of records into a
+    single write. Records of up to ``select.PIPE_BUF`` bytes (header included)
+    written to an unbuffered pipe therefore arrive atomically.
+
+    .. code-block:: python
+
+       with NPopen('w') as pipe:
+           proc = sp.Popen(['consumer', pipe.path])
+           writer = RecordWriter(pipe.wait())
+           for msg in messages:
+               writer.write(json.dumps(msg).encode())
+    """
+
+    def __init__(self, stream: IO):
+        self.stream = stream
+
+    def write(self, record) -> int:
+        """Write a record (a bytes-like object)
+
+        :return: number of payload bytes written
+        """
+        n = _nbytes(record)
+        if isinstance(record, bytes):
+            data = _HEADER.pack(n) + record
+        else:
+            data = bytearray(_HEADER.pack(n))
+            data += record
+        _write_full(self.stream, data)
+        return n
+
+    def writemany(self, records: Iterable) -> int:
+        """Write a sequence of records with one write
+
+        :return: number of payload bytes written
+        """
+        buf = bytearray()  # not reused: write-behind streams keep a reference
+        pack = _HEADER.pack
+        total = 0
+        for record in records:
+            n = _nbytes(record)
+            buf += pack(n)
+            buf += record
+            total += n
+        _write_full(self.stream, buf)
+        return total
+
+    def flush(self):
+        """Flush the underlying stream"""
+        self.stream.flush()
+
+
+class RecordReader:
+    """Read length-prefixed records written by :py:class:`RecordWriter`
+
+    :param stream: binary stream to read from, e.g., ``NPopen.stream``
+    :param max_size: maximum accepted record size in bytes, defaults to no limit
+    :param buffer_size: initial size of the internal buffer, defaults to 64 KiB
+
+    The stream is read in large chunks into an internal buffer, which is
+    reused (and only grown to fit a larger record) so that many small records
+    are parsed out of one read. A buffered stream is read with ``readinto1``,
+    so a record is returned as soon as it arrives rather than once a whole
+    chunk is read. A record returned by :py:meth:`read` is a view into this
+    buffer and is therefore valid until the next read. Use :py:meth:`readinto` to copy records into a
+    caller-provided buffer instead. As the reader reads ahead, the stream
+    should not be read directly once records are read.
+
+    .. code-block:: python
+
+       with NPopen('r', bufsize=0) as pipe:
+           proc = sp.Popen(['producer', pipe.path])
+           for record in RecordReader(pipe.wait()):
+               msg = json.loads(record)
+    """
+
+    def __init__(
+        self, stream: IO, max_size: Optional[int] = None, buffer_size: int = 1 << 16
+    ):
+        if buffer_size < _HEADER.size:
+            raise ValueError(f"buffer_size must be at least {_HEADER.size}")
+        self.stream = stream
+        self.max_size = max_size
+        self._buf = bytearray(buffer_size)
+        self._view = memoryview(self._buf)
+        self._pos = 0  # start of unparsed data
+        self._end = 0  # end of data read
+        # a buffered stream's readinto() blocks until the chunk is full
+        self._readinto = getattr(stream, "readinto1", stream.readinto)
+
+    def _fill(self, need: int) -> bool:
+        """read until the buffer holds ``need`` bytes past the current position
+
+        :return: False if the stream reaches EOF first
+        """
+        pos, end = self._pos, self._end
+        if pos + need > len(self._buf):
+            # move unparsed data to the front, into a larger buffer if needed
+            if need > len(self._buf):
+                buf = bytearray(max(need, 2 * len(self._buf)))
+                buf[: end - pos] = self._view[pos:end]
+                self._buf, self._view = buf, memoryview(buf)
+            else:
+                self._buf[: end - pos] = self._buf[pos:end]
+            pos, end = 0, end - pos
+            self._pos = pos
+
+        view = self._view
+        need += pos
+        while end < need:
+            n = self._readinto(view[end:])
+            if not n:
+                break
+            end += n
+        self._end = end
+        return end >= need
+
+    def read(self) -> Optional[memoryview]:
+        """Read next record
+
+        :return: record payload or None if the stream has reached EOF
+        :raises EOFError: if the stream ends in the middle of a record
+        """
+        if self._end - self._pos < _HEADER.size and not self._fill(_HEADER.size):
+            if self._end == self._pos:
+                return None
+            raise EOFError(
+                f"stream ended with a partial record header ({self._end - self._pos} bytes)"
+            )
+        (size,) = _HEADER.unpack_from(self._buf, self._pos)
+        if self.max_size is not None and size > self.max_size:
+            raise ValueError(f"record size ({size} bytes) exceeds max_size.")
+        if self._end - self._pos < _HEADER.size + size and not self._fill(
+            _HEADER.size + size
+        ):
+            nread = self._end - self._pos - _HEADER.size
+            raise EOFError(f"stream ended with a partial record ({nread} bytes)")
+        start = self._pos + _HEADER.size
+        self._pos = start + size
+        return self._view[start : self._pos]
+
+    def readinto(self, b) -> Optional[int]:
+        """Read next record into a pre-allocated, writable bytes-like object ``b``
+
+        :return: record size or None if the stream has reached EOF
+        :raises EOFError: if the stream ends in the middle of a record
+        """
+        record = self.read()
+        if record is None:
+            return None
+        size = len(record)
+        with memoryview(b) as mv, mv.cast("B") as flat:
+            if size > len(flat):
+                raise ValueError(f"buffer is too small for the record ({size} bytes)")
+            flat[:size] = record
+        return size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        while (record := self.read()) is not None:
+            yield record
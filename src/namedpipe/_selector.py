@@ -0,0 +1,106 @@
+import os, selectors, time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ._posix import NPopen
+
+
+class PipeSelector:
+    """Service many read pipes from a single thread
+
+    :param pipes: read pipes to register, more can be added by :py:meth:`register`
+    :param chunk_size: maximum number of bytes returned per event, defaults to 64 KiB
+
+    Registered pipes are opened in non-blocking mode, and a selector (epoll on
+    Linux) waits for the clients to connect and write. Each event is a
+    ``(pipe, chunk)`` pair, and a pipe is reported once more with an empty
+    ``chunk`` when its client closes the connection, after which the pipe is
+    unregistered (but not closed).
+
+    .. code-block:: python
+
+       pipes = [NPopen('r') for _ in cameras]
+       procs = [sp.Popen(['ffmpeg', '-i', url, ..., pipe.path]) for url, pipe in zip(cameras, pipes)]
+       with PipeSelector(pipes) as sel:
+           for pipe, chunk in sel:
+               ...
+
+    Waiting for the connection relies on an unconnected FIFO not being
+    reported as readable, which is the Linux behavior.
+    """
+
+    def __init__(self, pipes: Iterable[NPopen] = (), chunk_size: int = 1 << 16):
+        self.chunk_size = chunk_size
+        self._selector = selectors.DefaultSelector()
+        for pipe in pipes:
+            self.register(pipe)
+
+    def __len__(self) -> int:
+        """number of registered pipes"""
+        return len(self._selector.get_map())
+
+    def register(self, pipe: NPopen):
+        """Open a read pipe in non-blocking mode and register it"""
+        stream = pipe._open_nonblock()
+        self._selector.register(stream.fileno(), selectors.EVENT_READ, pipe)
+
+    def unregister(self, pipe: NPopen):
+        """Stop monitoring a pipe"""
+        self._selector.unregister(pipe.stream.fileno())
+
+    def select(self, timeout: Optional[float] = None) -> List[Tuple[NPopen, bytes]]:
+        """Wait until some registered pipes have data
+
+        :param timeout: maximum seconds to wait, defaults to wait indefinitely
+        :return: list of ``(pipe, chunk)`` events, empty if timed out
+        """
+        events = []
+        for key, _ in self._selector.select(timeout):
+            try:
+                chunk = os.read(key.fd, self.chunk_size)
+            except BlockingIOError:
+                continue  # spurious wakeup
+            if not chunk:
+                self._selector.unregister(key.fd)
+            events.append((key.data, chunk))
+        return events
+
+    def __iter__(self) -> Iterator[Tuple[NPopen, bytes]]:
+        """yield events until all the pipes reach EOF"""
+        while len(self):
+            yield from self.select()
+
+    def close(self):
+        """Unregister all pipes and close the selector (pipes are not closed)"""
+        self._selector.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+        return False
+
+
+def multiplex(
+    pipes: Iterable[NPopen],
+    chunk_size: int = 1 << 16,
+    timeout: Optional[float] = None,
+) -> Iterator[Tuple[NPopen, bytes]]:
+    """Read many pipes in one thread
+
+    :param pipes: read pipes
+    :param chunk_size: maximum number of bytes per event, defaults to 64 KiB
+    :param timeout: maximum seconds to wait for the next event, defaults to
+                    wait indefinitely. ``TimeoutError`` is raised if exceeded.
+    :return: iterator of ``(pipe, chunk)`` events, see :py:class:`PipeSelector`
+    """
+    with PipeSelector(pipes, chunk_size) as sel:
+        while len(sel):
+            if timeout is None:
+                yield from sel.select()
+                continue
+            deadline = time.monotonic() + timeout
+            while not (events := sel.select(max(deadline - time.monotonic(), 0))):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("timed out waiting for pipe data.")
+            yield from events
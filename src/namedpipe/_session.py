@@ -0,0 +1,155 @@
+import os, subprocess as sp, threading, time
+from typing import IO, Dict, Mapping, Optional, Sequence, Union
+
+from . import NPopen
+
+# time for the waits of a client which connected all the pipes and exited to
+# finish, once its exit is detected
+_EXIT_GRACE = 0.5
+
+
+class PipeSession:
+    """Subprocess communicating over a set of named pipes
+
+    :param args: command line of the subprocess. ``{name}`` in each argument is
+                 replaced by the path of the pipe named ``name``.
+    :param pipes: mapping of pipe names to ``NPopen`` mode strings or to dicts
+                  of ``NPopen`` keyword arguments
+    :param timeout: seconds to wait for the subprocess to connect all the pipes
+                    and, when the session ends, for it to exit
+    :param popen_kwargs: additional keyword arguments of :py:class:`subprocess.Popen`
+
+    Entering the session (or calling :py:meth:`start`) creates the pipes,
+    starts the subprocess, and waits for the connections to all the pipes
+    concurrently, so the order in which the subprocess opens them does not
+    matter. Leaving it (or calling :py:meth:`close`) closes all the pipes and
+    waits for the subprocess to exit. The subprocess is killed if the session
+    is left due to an exception.
+
+    .. code-block:: python
+
+       args = ['ffmpeg', '-f', 'rawvideo', ..., '-i', '{video}', '-f', 's16le', ...,
+               '-i', '{audio}', '-progress', '{progress}', 'output.mp4']
+       with PipeSession(args, {'video': 'w', 'audio': 'w', 'progress': 'rt'}) as session:
+           session.streams['video'].write(frame)
+           ...
+
+    The session fails with ``TimeoutError`` if ``timeout`` expires before the
+    subprocess connects all the pipes. On POSIX, it also fails with
+    ``RuntimeError`` if the subprocess exits before connecting all the pipes.
+    On Windows, ``NPopen.wait()`` takes no timeout, so the pending waits are
+    left behind in daemon threads when the session fails.
+    """
+
+    def __init__(
+        self,
+        args: Sequence[str],
+        pipes: Mapping[str, Union[str, dict]],
+        timeout: Optional[float] = None,
+        **popen_kwargs,
+    ):
+        self.args = list(args)
+        self.timeout = timeout
+        self.popen_kwargs = popen_kwargs
+        self._pipe_args = {
+            name: {"mode": kw} if isinstance(kw, str) else kw
+            for name, kw in pipes.items()
+        }
+        self.pipes: Dict[str, NPopen] = {}
+        self.proc: Optional[sp.Popen] = None
+
+    @property
+    def streams(self) -> Dict[str, IO]:
+        """dict: connected streams of the pipes"""
+        return {name: pipe.stream for name, pipe in self.pipes.items()}
+
+    def start(self):
+        """Create the pipes, start the subprocess, and wait for all connections"""
+
+        if self.pipes:
+            raise RuntimeError("session has already been started.")
+
+        try:
+            for name, kw in self._pipe_args.items():
+                self.pipes[name] = NPopen(**kw)
+
+            args = self.args
+            for name, pipe in self.pipes.items():
+                args = [arg.replace(f"{{{name}}}", pipe.path) for arg in args]
+            self.proc = sp.Popen(args, **self.popen_kwargs)
+
+            self._connect()
+        except:
+            self.close(kill=True)
+            raise
+
+    def _connect(self):
+        """wait for all the pipes concurrently, aborting if the subprocess exits"""
+
+        errors = {}
+
+        def wait(name, pipe):
+            try:
+                if os.name == "nt":
+                    pipe.wait()
+                else:
+                    pipe.wait(self.timeout)
+            except BaseException as e:
+                errors[name] = e
+
+        threads = [
+            threading.Thread(target=wait, args=item, daemon=True)
+            for item in self.pipes.items()
+        ]
+        for t in threads:
+            t.start()
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        for t in threads:
+            while t.is_alive() and not errors:
+                t.join(0.05)
+                if t.is_alive() and self.proc.poll() is not None:
+                    # a client which connected before exiting has unblocked
+                    # the waits, only their stream setup may be still running
+                    grace_end = time.monotonic() + _EXIT_GRACE
+                    for th in threads:
+                        th.join(max(grace_end - time.monotonic(), 0))
+                    if not any(th.is_alive() for th in threads):
+                        break
+                    # cancel pending waits
+                    for pipe in self.pipes.values():
+                        if not pipe:
+                            pipe.close()
+                    raise RuntimeError(
+                        f"subprocess exited (returncode={self.proc.returncode}) "
+                        "before connecting all the pipes."
+                    )
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError("timed out waiting for subprocess to connect.")
+            if errors:
+                raise next(iter(errors.values()))
+
+    def close(self, kill: bool = False):
+        """Close all the pipes and wait for the subprocess to exit
+
+        :param kill: True to kill the subprocess instead of waiting for it
+        """
+        if kill and self.proc is not None:
+            self.proc.kill()
+        try:
+            for pipe in self.pipes.values():
+                try:
+                    pipe.close()
+                except BrokenPipeError:
+                    pass  # subprocess closed its end early
+        finally:
+            if self.proc is not None:
+                self.proc.wait(self.timeout)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, *_):
+        self.close(kill=exc_type is not None)
+        return False
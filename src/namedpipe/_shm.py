@@ -0,0 +1,303 @@
+import hashlib
+import os
+import select
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import IO, Iterator, Optional
+
+from . import NPopen
+
+# shared memory header: bytes released by consumer, ring capacity
+_HEADER = struct.Struct("<QQ")
+# notification sent over the pipe: ring offset (monotonic), message length
+_NOTICE = struct.Struct("<QQ")
+
+# upper bound of the polling interval while the producer waits for ring space
+_POLL_MAX = 0.001
+
+
+def _shm_name(pipe_path: str) -> str:
+    """shared memory name derived from the pipe path (short enough for macOS)"""
+    return "np_" + hashlib.sha1(pipe_path.encode()).hexdigest()[:20]
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """attach existing shared memory without handing it to the resource tracker
+
+    Only for clients: the creating process must keep its registration, so the
+    segment is unlinked if it dies without closing the pipe.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)  # py3.13+
+    except TypeError:
+        pass
+    if os.name == "nt":
+        return shared_memory.SharedMemory(name)
+
+    # the tracker may be shared with the creator (thread or child process) and
+    # keeps one entry per name, so skip registering rather than unregister
+    from multiprocessing import resource_tracker
+
+    with _attach_lock:
+        register = resource_tracker.register
+
+        def skip_own(rname, rtype):
+            if rtype != "shared_memory" or rname.lstrip("/") != name:
+                register(rname, rtype)
+
+        resource_tracker.register = skip_own
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+def _close_shm(shm: shared_memory.SharedMemory):
+    try:
+        shm.close()
+    except BufferError:
+        pass  # received messages still referenced, unmapped once released
+
+
+class ShmChannel:
+    """One-way message channel over a shared memory ring and a pipe
+
+    Created by :py:meth:`ShmNPopen.wait` (server) or :py:func:`shm_connect`
+    (client). The sender copies each message into the ring and sends only its
+    offset and length through the pipe. The receiver gets a ``memoryview``
+    into the ring, which stays valid until the next :py:meth:`recv` call.
+    A client channel detaches from the shared memory when closed, while the
+    server's mapping is closed by :py:class:`ShmNPopen`.
+    """
+
+    def __init__(
+        self,
+        stream: IO,
+        shm: shared_memory.SharedMemory,
+        sender: bool,
+        close_shm: bool = True,
+    ):
+        self.stream = stream
+        self._shm = shm
+        self._sender = sender
+        self._close_shm = close_shm  # detach from the shared memory on close
+        self._header = shm.buf[: _HEADER.size]
+        self.capacity = _HEADER.unpack_from(self._header)[1]
+        self._ring = shm.buf[_HEADER.size : _HEADER.size + self.capacity]
+        self._head = 0  # sender: end of last message
+        self._release = None  # receiver: end of message to be released
+        self._msg: Optional[memoryview] = None  # receiver: last returned message
+        # sender: reports POLLERR/POLLHUP once the receiver has gone away
+        self._poller = None
+        if sender and hasattr(select, "poll"):
+            self._poller = select.poll()
+            self._poller.register(stream.fileno(), 0)
+
+    def _released(self) -> int:
+        return _HEADER.unpack_from(self._header)[0]
+
+    def send(self, data):
+        """Send a message (a bytes-like object)
+
+        Blocks while the ring does not have enough free space.
+
+        :raises BrokenPipeError: if the receiver closes the channel while the
+                                 sender waits for space (POSIX)
+        """
+        if not self._sender:
+            raise ValueError("channel is not for sending.")
+        with memoryview(data) as mv, mv.cast("B") as src:
+            n = len(src)
+            if n > self.capacity:
+                raise ValueError("message is larger than the ring buffer.")
+
+            # messages are contiguous: skip the ring end if it does not fit
+            start = self._head
+            pos = start % self.capacity
+            if pos + n > self.capacity:
+                start += self.capacity - pos
+                pos = 0
+
+            # wait until the slot does not overlap unreleased messages
+            delay = 1e-6
+            while (released := self._released()) < self._head and (
+                start + n - released > self.capacity
+            ):
+                if self._poller is not None and self._poller.poll(0):
+                    raise BrokenPipeError("receiver has closed the channel.")
+                time.sleep(delay)
+                delay = min(2 * delay, _POLL_MAX)
+
+            self._ring[pos : pos + n] = src
+        self._head = start + n
+        self.stream.write(_NOTICE.pack(start, n))
+
+    def recv(self) -> Optional[memoryview]:
+        """Receive next message
+
+        :return: view of the message in the ring or None if the sender has
+                 closed the channel. The view is valid until the next call.
+        """
+        if self._sender:
+            raise ValueError("channel is not for receiving.")
+        if self._release is not None:
+            self._release_msg()
+            _HEADER.pack_into(self._header, 0, self._release, self.capacity)
+            self._release = None
+
+        notice = bytearray(_NOTICE.size)
+        nread = 0
+        while nread < len(notice):
+            n = self.stream.readinto(memoryview(notice)[nread:])
+            if not n:
+                if nread:
+                    raise EOFError("incomplete message notification")
+                return None
+            nread += n
+
+        start, n = _NOTICE.unpack(notice)
+        self._release = start + n
+        pos = start % self.capacity
+        self._msg = self._ring[pos : pos + n]
+        return self._msg
+
+    def _release_msg(self):
+        """invalidate the last returned message, so it does not pin the mapping"""
+        if self._msg is not None:
+            try:
+                self._msg.release()
+            except BufferError:
+                pass  # exported further by the caller
+            self._msg = None
+
+    def __iter__(self) -> Iterator[memoryview]:
+        while (msg := self.recv()) is not None:
+            yield msg
+
+    def close(self):
+        """Close the pipe stream and detach from the shared memory"""
+        if self.stream is None:
+            return
+        self.stream.close()
+        self.stream = None
+        self._release_msg()
+        self._ring.release()
+        self._header.release()
+        if self._close_shm:
+            _close_shm(self._shm)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+        return False
+
+
+class ShmNPopen:
+    """Named pipe paired with a shared memory ring buffer for bulk data
+
+    :param mode: ``'w'`` to send messages to the client or ``'r'`` to receive
+    :param size: capacity of the ring buffer in bytes, defaults to 64 MiB
+    :param name: pipe name, see ``NPopen``
+
+    The pipe path serves as the rendezvous point like ``NPopen``: the client
+    calls :py:func:`shm_connect` with the path to attach to the shared memory
+    (whose name is derived from the path) and to open the pipe, which only
+    carries the offsets and lengths of the messages in the ring. Bulk data is
+    thus copied once by the sender and not at all by the receiver.
+
+    .. code-block:: python
+
+       with ShmNPopen('w') as pipe:
+           proc = ctx.Process(target=worker, args=(pipe.path,))
+           proc.start()
+           channel = pipe.wait()
+           for frame in frames:
+               channel.send(frame)
+
+       def worker(path):
+           with shm_connect(path, 'r') as channel:
+               for frame in channel:
+                   ...
+    """
+
+    def __init__(self, mode: str = "w", size: int = 1 << 26, name: Optional[str] = None):
+        if mode not in ("r", "w"):
+            raise ValueError("mode must be 'r' or 'w'")
+        if size <= 0:
+            raise ValueError("size must be a positive integer")
+
+        self._pipe = NPopen(mode + "b", bufsize=0, name=name)
+        try:
+            self._shm = shared_memory.SharedMemory(
+                _shm_name(self._pipe.path), create=True, size=_HEADER.size + size
+            )
+        except:
+            self._pipe.close()
+            raise
+        _HEADER.pack_into(self._shm.buf, 0, 0, size)
+        self.channel: Optional[ShmChannel] = None
+
+    @property
+    def path(self) -> str:
+        """str: path of the pipe"""
+        return self._pipe.path
+
+    def __str__(self):
+        return self.path
+
+    def wait(self, *args, **kwargs) -> ShmChannel:
+        """Wait for client connection and return the message channel
+
+        Arguments are passed to ``NPopen.wait()``.
+        """
+        stream = self._pipe.wait(*args, **kwargs)
+        # the mapping stays tracked by this process, which unlinks it
+        self.channel = ShmChannel(
+            stream, self._shm, self._pipe.writable(), close_shm=False
+        )
+        self._pipe.stream = None  # closed by the channel
+        return self.channel
+
+    def close(self):
+        """Close the channel and the pipe and free the shared memory"""
+        if self.channel is not None:
+            self.channel.close()
+            self.channel = None
+        self._pipe.close()
+        if self._shm is not None:
+            _close_shm(self._shm)
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+        return False
+
+
+def shm_connect(path: str, mode: str = "r") -> ShmChannel:
+    """Connect to a ShmNPopen pipe as a client
+
+    :param path: path of the pipe
+    :param mode: ``'r'`` to receive messages (server mode ``'w'``) or ``'w'`` to
+                 send messages (server mode ``'r'``)
+    :return: message channel
+    """
+    if mode not in ("r", "w"):
+        raise ValueError("mode must be 'r' or 'w'")
+    shm = _attach(_shm_name(path))
+    try:
+        stream = open(path, mode + "b", buffering=0)
+    except:
+        shm.close()
+        raise
+    return ShmChannel(stream, shm, mode == "w")
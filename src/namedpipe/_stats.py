@@ -0,0 +1,122 @@
+import io, time
+from typing import Callable, Optional
+
+from ._rawio import ExactReadMixin
+
+StatsHook = Callable[[str, int, float], None]
+
+
+class PipeStats:
+    """I/O statistics of an instrumented pipe
+
+    :param hook: optional callable ``hook(op, nbytes, elapsed)`` invoked after
+                 every recorded operation, where ``op`` is ``"wait"``,
+                 ``"read"``, or ``"write"``, ``nbytes`` is the number of bytes
+                 transferred, and ``elapsed`` is the seconds spent in the call
+
+    Counts are recorded at the raw I/O level, i.e., once per system call, so
+    they are not affected by the stream buffer. ``read_time`` and
+    ``write_time`` are the seconds blocked in the system calls, and
+    ``wait_time`` is the seconds spent waiting for the client to connect.
+    """
+
+    def __init__(self, hook: Optional[StatsHook] = None):
+        self.hook = hook
+        self.wait_time = 0.0
+        self.connected_at: Optional[float] = None  # time.monotonic() at connection
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.reads = 0
+        self.writes = 0
+        self.read_time = 0.0
+        self.write_time = 0.0
+
+    def record(self, op: str, nbytes: int, elapsed: float):
+        """Record an operation"""
+        if op == "read":
+            self.reads += 1
+            self.bytes_read += nbytes
+            self.read_time += elapsed
+        elif op == "write":
+            self.writes += 1
+            self.bytes_written += nbytes
+            self.write_time += elapsed
+        elif op == "wait":
+            self.wait_time += elapsed
+            self.connected_at = time.monotonic()
+        else:
+            raise ValueError(f"unknown operation {op!r}")
+        if self.hook is not None:
+            self.hook(op, nbytes, elapsed)
+
+    def snapshot(self) -> dict:
+        """Return current statistics as a dict
+
+        In addition to the attributes, ``elapsed`` is the seconds since the
+        connection, and ``read_rate`` and ``write_rate`` are the average
+        throughputs over ``elapsed`` in bytes per second.
+        """
+        elapsed = (
+            0.0 if self.connected_at is None else time.monotonic() - self.connected_at
+        )
+        return {
+            "wait_time": self.wait_time,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "reads": self.reads,
+            "writes": self.writes,
+            "read_time": self.read_time,
+            "write_time": self.write_time,
+            "elapsed": elapsed,
+            "read_rate": self.bytes_read / elapsed if elapsed else 0.0,
+            "write_rate": self.bytes_written / elapsed if elapsed else 0.0,
+        }
+
+
+class StatsRawIO(ExactReadMixin, io.RawIOBase):
+    """Raw I/O layer recording the operations of another raw stream
+
+    :param raw: raw stream to be wrapped
+    :param stats: statistics to update
+    """
+
+    def __init__(self, raw: io.RawIOBase, stats: PipeStats):
+        super().__init__()
+        self.raw = raw
+        self.stats = stats
+
+    def readable(self) -> bool:
+        return self.raw.readable()
+
+    def writable(self) -> bool:
+        return self.raw.writable()
+
+    def seekable(self) -> bool:
+        return False
+
+    def fileno(self) -> int:
+        return self.raw.fileno()
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.raw.close()
+        finally:
+            super().close()
+
+    def readinto(self, b) -> Optional[int]:
+        t0 = time.perf_counter()
+        n = self.raw.readinto(b)
+        self.stats.record("read", n or 0, time.perf_counter() - t0)
+        return n
+
+    def write(self, b) -> Optional[int]:
+        t0 = time.perf_counter()
+        n = self.raw.write(b)
+        self.stats.record("write", n or 0, time.perf_counter() - t0)
+        return n
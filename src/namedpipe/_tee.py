@@ -0,0 +1,329 @@
+import errno, fcntl, io, os, select, stat, sys, termios
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+from ._posix import NPopen, _as_fd, _flush_all, _write_all
+
+POLICIES = ("block", "drop", "buffer")
+
+# default limit of the bytes queued for a "buffer" target
+_BUFFER_LIMIT = 1 << 24
+
+
+def _load_tee() -> Optional[Callable[[int, int, int, int], int]]:
+    """tee(2) via ctypes if the platform has it along with os.splice()"""
+    if not sys.platform.startswith("linux") or not hasattr(os, "splice"):
+        return None
+    import ctypes
+
+    try:
+        libc_tee = ctypes.CDLL(None, use_errno=True).tee
+    except (OSError, AttributeError):
+        return None
+    libc_tee.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_size_t, ctypes.c_uint]
+    libc_tee.restype = ctypes.c_ssize_t
+
+    def tee(fd_in: int, fd_out: int, count: int, flags: int) -> int:
+        n = libc_tee(fd_in, fd_out, count, flags)
+        if n < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        return n
+
+    return tee
+
+
+def _fionread(fd: int) -> int:
+    """number of bytes available in a pipe"""
+    return int.from_bytes(fcntl.ioctl(fd, termios.FIONREAD, bytes(4)), sys.byteorder)
+
+
+def _wait(fd: int, event: int):
+    """block until fd is ready, via poll() as select() rejects fds >= FD_SETSIZE"""
+    poller = select.poll()
+    poller.register(fd, event)
+    poller.poll()
+
+
+def _is_pipe(fd: int) -> bool:
+    return stat.S_ISFIFO(os.fstat(fd).st_mode)
+
+
+def _target_fd(obj) -> int:
+    """file descriptor of a destination, flushed"""
+    if isinstance(obj, NPopen):
+        stream = obj._binary_stream(obj.writable())
+        _flush_all(stream)
+        return stream.fileno()
+    return _as_fd(obj)
+
+
+class TeeTarget:
+    """Destination of :py:class:`PipeTee` and its delivery counters"""
+
+    def __init__(self, target, fd: int, policy: str, limit: int):
+        self.target = target  #: NPopen, file object, or file descriptor
+        self.fd = fd
+        self.policy = policy
+        self.limit = limit
+        self.nbytes = 0  #: bytes delivered
+        self.dropped = 0  #: bytes dropped ("drop" policy)
+        self.error: Optional[OSError] = None  #: set if the consumer went away
+        self.buffered = 0  #: bytes queued ("buffer" policy)
+        self._pipe = _is_pipe(fd)
+        self._splice = True  # False if splice() is not supported
+        self._queue: Deque[bytes] = deque()  # "buffer" policy backlog
+        self._blocking = os.get_blocking(fd)
+
+    @property
+    def closed(self) -> bool:
+        """bool: True if the consumer went away (broken pipe)"""
+        return self.error is not None
+
+
+class PipeTee:
+    """Duplicate one input pipe to multiple destinations
+
+    :param source: connected read ``NPopen``, a readable file object, or a file
+                   descriptor
+    :param targets: destinations added with the ``'block'`` policy, more can be
+                    added by :py:meth:`add`
+    :param chunk_size: maximum number of bytes moved per round, defaults to 64 KiB
+
+    Destinations are connected write ``NPopen`` objects, writable file
+    objects, or file descriptors. On Linux with a pipe source, the data is
+    duplicated to the pipe destinations by ``tee(2)`` (via ``ctypes``) and
+    consumed by ``splice(2)`` to a ``'block'`` destination, so it is not
+    copied through Python unless a destination lags behind. Otherwise, or for
+    the lagging part, the data is read once into a reused buffer and written
+    to each destination.
+
+    Each destination has a backpressure policy:
+
+    * ``'block'``: wait for the consumer (slows down all the others)
+    * ``'drop'``: discard the data the consumer cannot take right away
+    * ``'buffer'``: queue the data the consumer cannot take right away, up to
+      ``limit`` bytes, beyond which it blocks
+
+    ``'drop'`` and ``'buffer'`` destinations are switched to non-blocking mode
+    during :py:meth:`run`. A destination whose consumer goes away (broken
+    pipe) is skipped from then on. Destinations are not closed by the tee.
+
+    .. code-block:: python
+
+       with NPopen('r') as src, NPopen('w') as archive, NPopen('w') as preview:
+           ffmpeg = sp.Popen(['ffmpeg', ..., src.path])
+           sp.Popen(['archiver', archive.path]), sp.Popen(['analyzer', preview.path])
+           src.wait(), archive.wait(), preview.wait()
+           tee = PipeTee(src, [archive])
+           tee.add(preview, policy='drop')
+           tee.run()
+    """
+
+    def __init__(self, source, targets=(), chunk_size: int = 1 << 16):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        self.source = source
+        self.chunk_size = chunk_size
+        self.targets: List[TeeTarget] = []
+        self._buf = bytearray(chunk_size)
+        for target in targets:
+            self.add(target)
+
+    def add(
+        self, target, policy: str = "block", limit: Optional[int] = None
+    ) -> TeeTarget:
+        """Add a destination
+
+        :param target: connected write ``NPopen``, writable file object, or
+                       file descriptor
+        :param policy: ``'block'``, ``'drop'``, or ``'buffer'``
+        :param limit: maximum queued bytes of a ``'buffer'`` destination,
+                      defaults to 16 MiB
+        :return: object holding the delivery counters of the destination
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        if limit is not None and policy != "buffer":
+            raise ValueError("limit is only valid with the 'buffer' policy")
+        fd = _target_fd(target)
+        t = TeeTarget(target, fd, policy, _BUFFER_LIMIT if limit is None else limit)
+        self.targets.append(t)
+        return t
+
+    def run(self) -> int:
+        """Forward the source to all the destinations until EOF
+
+        :return: number of bytes read from the source
+
+        Returns early if all the consumers go away. Data queued for
+        ``'buffer'`` destinations is written out before returning.
+        """
+        src = self.source
+        if isinstance(src, NPopen):
+            src = src._binary_stream(src.readable())
+        total = 0
+        for t in self.targets:
+            if t.policy != "block":
+                os.set_blocking(t.fd, False)
+        try:
+            if isinstance(src, io.BufferedReader):
+                # data already in the buffer bypasses the file descriptor
+                data = src.read1(self.chunk_size)
+                if not data:
+                    return 0
+                total += len(data)
+                self._deliver(memoryview(data), self.targets)
+            fd = _as_fd(src)
+            tee = _load_tee() if _is_pipe(fd) else None
+            step = self._copy if tee is None else lambda fd: self._tee(fd, tee)
+            while any(not t.closed for t in self.targets):
+                n = step(fd)
+                if not n:
+                    break
+                total += n
+            for t in self.targets:
+                if t._queue and not t.closed:
+                    self._flush_queue(t, 0)
+        finally:
+            for t in self.targets:
+                os.set_blocking(t.fd, t._blocking)
+        return total
+
+    def _copy(self, fd: int) -> int:
+        """forward next chunk through the userspace buffer"""
+        with memoryview(self._buf) as mv:
+            n = os.readv(fd, [mv])
+            self._flush_queues()
+            self._deliver(mv[:n], self.targets)
+        return n
+
+    def _flush_queues(self):
+        """write what the "buffer" destinations take right away"""
+        for t in self.targets:
+            if t._queue and not t.closed:
+                self._flush_queue(t, None)
+
+    def _tee(self, fd: int, tee) -> int:
+        """forward next chunk with tee() and splice()"""
+        _wait(fd, select.POLLIN)
+        n = min(_fionread(fd), self.chunk_size)
+        if not n:
+            return 0  # EOF: readable with nothing to read
+
+        self._flush_queues()
+
+        # the last blocking destination consumes the data by splice()
+        live = [t for t in self.targets if not t.closed]
+        consumer = next(
+            (t for t in reversed(live) if t.policy == "block" and t._splice), None
+        )
+        lagging = []  # (target, bytes already delivered)
+        for t in live:
+            if t is consumer:
+                continue
+            if not t._pipe or t._queue:
+                lagging.append((t, 0))
+                continue
+            flags = 0 if t.policy == "block" else os.SPLICE_F_NONBLOCK
+            try:
+                m = tee(fd, t.fd, n, flags)
+            except BlockingIOError:
+                m = 0
+            except BrokenPipeError as e:
+                t.error = e
+                continue
+            t.nbytes += m
+            if m < n:
+                lagging.append((t, m))
+
+        if consumer is not None and not lagging:
+            done = self._splice(fd, consumer, n)
+            if done is not None:
+                if done < n:  # consumer went away: consume the rest
+                    with memoryview(self._buf)[: n - done] as mv:
+                        os.readv(fd, [mv])
+                return n
+
+        with memoryview(self._buf)[:n] as mv:
+            os.readv(fd, [mv])
+            if consumer is not None:
+                self._deliver(mv, [consumer])
+            for t, m in lagging:
+                self._deliver(mv[m:], [t])
+        return n
+
+    def _splice(self, fd: int, t: TeeTarget, n: int) -> Optional[int]:
+        """move n bytes to a destination
+
+        :return: bytes moved, or None if splice() does not support it
+        """
+        done = 0
+        while done < n:
+            try:
+                done += os.splice(fd, t.fd, n - done)
+            except BrokenPipeError as e:
+                t.error = e
+                break
+            except OSError as e:
+                # unsupported file types are only reported by the first call
+                if done or e.errno not in (errno.EINVAL, errno.ENOSYS):
+                    raise
+                t._splice = False
+                return None
+        t.nbytes += done
+        return done
+
+    def _deliver(self, mv: memoryview, targets: List[TeeTarget]):
+        """write data to destinations according to their policies"""
+        for t in targets:
+            if t.closed:
+                continue
+            try:
+                if t.policy == "block":
+                    _write_all(t.fd, mv)
+                    t.nbytes += len(mv)
+                    continue
+                n = 0
+                if not t._queue:
+                    try:
+                        n = os.write(t.fd, mv)
+                    except BlockingIOError:
+                        pass
+                    t.nbytes += n
+                if t.policy == "drop":
+                    t.dropped += len(mv) - n
+                elif n < len(mv):
+                    t._queue.append(bytes(mv[n:]))
+                    t.buffered += len(mv) - n
+                    if t.buffered > t.limit:
+                        self._flush_queue(t, t.limit)
+            except BrokenPipeError as e:
+                t.error = e
+
+    def _flush_queue(self, t: TeeTarget, limit: Optional[int]):
+        """write queued data of a "buffer" destination
+
+        :param limit: block until at most this many bytes are queued, or None
+                      to write only what the consumer takes right away
+        """
+        queue = t._queue
+        try:
+            while queue:
+                try:
+                    n = os.write(t.fd, queue[0])
+                except BlockingIOError:
+                    if limit is None or t.buffered <= limit:
+                        return
+                    _wait(t.fd, select.POLLOUT)
+                    continue
+                t.nbytes += n
+                t.buffered -= n
+                if n < len(queue[0]):
+                    queue[0] = queue[0][n:]
+                else:
+                    queue.popleft()
+        except BrokenPipeError as e:
+            t.error = e
+            queue.clear()
+            t.buffered = 0
@@ -1,7 +1,11 @@
 import ctypes
 import io
 from ctypes import wintypes
-from typing import IO, Literal, NewType, Optional, TypeVar, Union
+import time
+from typing import IO, Callable, Literal, NewType, Optional, TypeVar, Union
+
+from ._rawio import ExactReadMixin
+from ._stats import PipeStats, StatsRawIO
 
 WritableBuffer = TypeVar("WritableBuffer")
 PyHANDLE = NewType("PyHANDLE", int)
@@ -13,7 +17,10 @@ PIPE_ACCESS_OUTBOUND = 0x00000002
 PIPE_TYPE_BYTE = 0x00000000
 PIPE_READMODE_BYTE = 0x00000000
 PIPE_WAIT = 0x00000000
-PIPE_UNLIMITED_INSTANCES = 0xFFFFFFFF
+PIPE_UNLIMITED_INSTANCES = 255
+FILE_FLAG_FIRST_PIPE_INSTANCE = 0x00080000
+ERROR_ACCESS_DENIED = 5
+ERROR_PIPE_BUSY = 231
 ERROR_PIPE_CONNECTED = 535
 ERROR_BROKEN_PIPE = 109
 ERROR_MORE_DATA = 234
@@ -23,6 +30,9 @@ INVALID_HANDLE_VALUE = -1
 GENERIC_READ = 0x80000000
 OPEN_EXISTING = 3
 
+READAHEAD_SIZE = 65536  # size of read-ahead buffers
+COALESCE_SIZE = 65536  # default size of write-behind chunks
+
 id = 0
 
 
@@ -47,6 +57,17 @@ def _generate_pipe_path(name: str | None) -> str:
     return rf"\\.\pipe\{pname}"
 
 
+_kernel32_dll = None
+
+
+def _kernel32():
+    """kernel32 library, loaded once per process"""
+    global _kernel32_dll
+    if _kernel32_dll is None:
+        _kernel32_dll = ctypes.WinDLL("kernel32", use_last_error=True)
+    return _kernel32_dll
+
+
 def _win_error(code=None):
     if not code:
         code = ctypes.get_last_error()
@@ -65,16 +86,50 @@ class NPopen:
         errors: Optional[str] = None,
         newline: Optional[Literal["", "\n", "\r", "\r\n"]] = None,
         name: Optional[str] = None,
+        pipe_size: Optional[int] = None,
+        stats: Union[bool, Callable[[str, int, float], None]] = False,
+        readahead: int = 0,
+        writebehind: int = 0,
+        overlapped: int = 0,
+        in_buffer_size: Optional[int] = None,
+        out_buffer_size: Optional[int] = None,
+        max_instances: int = 1,
     ):
+        if pipe_size is not None and pipe_size <= 0:
+            raise ValueError("pipe_size must be a positive integer")
+        if in_buffer_size is not None and in_buffer_size < 0:
+            raise ValueError("in_buffer_size must be a non-negative integer")
+        if out_buffer_size is not None and out_buffer_size < 0:
+            raise ValueError("out_buffer_size must be a non-negative integer")
+        if not 1 <= max_instances <= PIPE_UNLIMITED_INSTANCES:
+            raise ValueError(
+                f"max_instances must be between 1 and {PIPE_UNLIMITED_INSTANCES}"
+            )
         if bufsize is None:
             bufsize = -1  # Restore default
         if not isinstance(bufsize, int):
             raise TypeError("bufsize must be an integer")
-
-        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        if readahead < 0:
+            raise ValueError("readahead must be a non-negative integer")
+        if writebehind < 0:
+            raise ValueError("writebehind must be a non-negative integer")
+        if overlapped < 0:
+            raise ValueError("overlapped must be a non-negative integer")
+
+        self.kernel32 = _kernel32()
         self.stream: Union[IO, None] = None  # I/O stream of the pipe
+        self._stats = (
+            None if stats is False else PipeStats(None if stats is True else stats)
+        )
         self._rd = any(mode and c in mode for c in "r+")
         self._wr = any(mode and c in mode for c in "wax+")
+        if readahead and self._wr:
+            raise ValueError("readahead requires a read-only mode")
+        self._readahead = readahead  # number of read-ahead buffers
+        if writebehind and self._rd:
+            raise ValueError("writebehind requires a write-only mode")
+        self._writebehind = writebehind  # high-water mark of write-behind queue
+        self._overlapped = overlapped  # outstanding requests per direction
 
         if encoding or errors or newline:
             if mode and "b" in mode:
@@ -107,15 +162,24 @@ class NPopen:
             access = _wt(PIPE_ACCESS_OUTBOUND)
         else:
             raise ValueError("Invalid mode")
-        # TODO: assess options: FILE_FLAG_WRITE_THROUGH, FILE_FLAG_OVERLAPPED, FILE_FLAG_FIRST_PIPE_INSTANCE
+        if overlapped:
+            from ._overlapped import FILE_FLAG_OVERLAPPED
+
+            access = _wt(access.value | FILE_FLAG_OVERLAPPED)
+        if name is None and max_instances > 1:
+            # fail instead of joining a generated name used by another process
+            access = _wt(access.value | FILE_FLAG_FIRST_PIPE_INSTANCE)
+        # TODO: assess options: FILE_FLAG_WRITE_THROUGH
         pipe_mode = _wt(PIPE_TYPE_BYTE | PIPE_READMODE_BYTE | PIPE_WAIT)
 
         # TODO: assess options: PIPE_WAIT, PIPE_NOWAIT, PIPE_ACCEPT_REMOTE_CLIENTS, PIPE_REJECT_REMOTE_CLIENTS
 
-        max_instances = _wt(
-            1
-        )  # PIPE_UNLIMITED_INSTANCES returns 'invalid params'. Pipes are point-to-point anyway
-        buffer_size = _wt(0)
+        # pipe_size applies to both buffers unless given separately. The system
+        # treats the sizes as advisory, 0 leaving them to its minimum.
+        default_size = 0 if pipe_size is None else pipe_size
+        in_size = _wt(default_size if in_buffer_size is None else in_buffer_size)
+        out_size = _wt(default_size if out_buffer_size is None else out_buffer_size)
+        instances = _wt(max_instances)
         timeout = _wt(0)
 
         def try_open_pipe(name: str | None) -> bool:
@@ -127,9 +191,9 @@ class NPopen:
                 pipe_path,
                 access,
                 pipe_mode,
-                max_instances,
-                buffer_size,
-                buffer_size,
+                instances,
+                out_size,
+                in_size,
                 timeout,
                 None,
             )
@@ -137,10 +201,12 @@ class NPopen:
             if h == INVALID_HANDLE_VALUE:
                 error_code = ctypes.get_last_error()
 
-                if name or error_code != 231:
+                if name or error_code not in (ERROR_PIPE_BUSY, ERROR_ACCESS_DENIED):
                     raise ctypes.WinError(error_code)
                 else:
-                    # ERROR_PIPE_BUSY (231) means the pipe exists but all instances are occupied
+                    # ERROR_PIPE_BUSY means the pipe exists but all instances are
+                    # occupied, ERROR_ACCESS_DENIED that it exists
+                    # (FILE_FLAG_FIRST_PIPE_INSTANCE)
                     return True  # already used
 
             self._path = pipe_path
@@ -158,6 +224,25 @@ class NPopen:
         """str: path of the pipe in the file system"""
         return self._path
 
+    @property
+    def pipe_size(self) -> Optional[int]:
+        """int|None: buffer size of the connected pipe in bytes as reported by the
+        system, the input buffer of a read-only pipe and the output buffer otherwise"""
+        if self.stream is None or not self._pipe:
+            return None
+        out_size = _wt(0)
+        in_size = _wt(0)
+        if not self.kernel32.GetNamedPipeInfo(
+            self._pipe, None, ctypes.byref(out_size), ctypes.byref(in_size), None
+        ):
+            raise _win_error()
+        return in_size.value if not self._wr else out_size.value
+
+    @property
+    def stats(self) -> Optional[PipeStats]:
+        """PipeStats|None: I/O statistics if instrumented by the ``stats`` argument"""
+        return self._stats
+
     def __str__(self):
         return self._path
 
@@ -177,17 +262,39 @@ class NPopen:
         """Wait for the pipe to open (the other end to be opened) and return file object to read/write."""
         if not self._pipe:
             raise RuntimeError("pipe has already been closed.")
-        if not self.kernel32.ConnectNamedPipe(self._pipe, None):
-            code = ctypes.get_last_error()
-            if (
-                code != ERROR_PIPE_CONNECTED
-            ):  # (ok, just indicating that the client has already connected)(Issue#3)
-                raise _win_error(code)
-
-        # create new io stream object
-        stream = Win32RawIO(self._pipe, self._rd, self._wr)
+        t0 = time.perf_counter()
+        if self._overlapped:
+            from ._overlapped import OverlappedRawIO, connect
 
-        if self._bufsize:
+            connect(self._pipe)
+            stream = OverlappedRawIO(self._pipe, self._rd, self._wr, self._overlapped)
+        else:
+            if not self.kernel32.ConnectNamedPipe(self._pipe, None):
+                code = ctypes.get_last_error()
+                if (
+                    code != ERROR_PIPE_CONNECTED
+                ):  # (ok, just indicating that the client has already connected)(Issue#3)
+                    raise _win_error(code)
+
+            # create new io stream object
+            stream = Win32RawIO(self._pipe, self._rd, self._wr)
+        if self._stats is not None:
+            self._stats.record("wait", 0, time.perf_counter() - t0)
+            stream = StatsRawIO(stream, self._stats)
+        if self._readahead:
+            from ._prefetch import PrefetchRawIO
+
+            stream = PrefetchRawIO(stream, self._readahead, READAHEAD_SIZE)
+
+        if self._writebehind:
+            from ._writebehind import WriteBehindIO
+
+            stream = WriteBehindIO(
+                stream,
+                self._writebehind,
+                self._bufsize if self._bufsize > 1 else COALESCE_SIZE,
+            )
+        elif self._bufsize:
             Wrapper = (
                 io.BufferedRandom
                 if self._rd and self._wr
@@ -224,7 +331,7 @@ class NPopen:
         return self._wr
 
 
-class Win32RawIO(io.RawIOBase):
+class Win32RawIO(ExactReadMixin, io.RawIOBase):
     """Raw I/O stream layer over open Windows pipe handle.
 
     `handle` is an open Windows ``HANDLE`` object (from ``ctype`` package) to
@@ -235,7 +342,7 @@ class Win32RawIO(io.RawIOBase):
 
     def __init__(self, handle: PyHANDLE, rd: bool, wr: bool) -> None:
         super().__init__()
-        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.kernel32 = _kernel32()
         self.handle = handle  # Underlying Windows handle.
         self._readable: bool = rd
         self._writable: bool = wr
@@ -282,7 +389,7 @@ class Win32RawIO(io.RawIOBase):
         if not success:
             code = ctypes.get_last_error()
             # ERROR_MORE_DATA - not big deal, will read next time
-            # ERROR_IO_PENDING - should not happen, unless use OVERLAPPING, which we don't so far
+            # ERROR_IO_PENDING - should not happen, overlapped handles are read by OverlappedRawIO
             # ERROR_BROKEN_PIPE - pipe was closed from other end. While it is an error, test seemingly expects to receive 0 instead of exception
             if code not in (ERROR_MORE_DATA, ERROR_IO_PENDING, ERROR_BROKEN_PIPE):
                 raise _win_error(code)
@@ -0,0 +1,138 @@
+import io, threading
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class WriteBehindIO(io.BufferedIOBase):
+    """Buffered writer handing data over to a background writer thread
+
+    :param raw: writable raw stream to be wrapped
+    :param high_water: number of bytes queued for the writer thread above which
+                       :py:meth:`write` blocks until the queue is drained
+    :param coalesce_size: writes smaller than this are copied and combined into
+                          chunks of this size. Larger ones are queued by
+                          reference, without copying.
+
+    A buffer queued by reference must not be modified until it is written, which
+    is guaranteed after :py:meth:`drain`. :py:meth:`flush` hands over the
+    combined small writes to the writer thread without waiting, and
+    :py:meth:`drain` waits until all the data is written to the raw stream.
+    Errors raised in the writer thread are re-raised by the next call.
+    """
+
+    def __init__(self, raw: io.RawIOBase, high_water: int, coalesce_size: int):
+        if high_water <= 0:
+            raise ValueError("high_water must be a positive integer")
+        super().__init__()
+        self.raw = raw
+        self.high_water = high_water
+        self.coalesce_size = coalesce_size
+        self._pending = bytearray()  # combined small writes
+        self._queue: Deque[Tuple[object, int]] = deque()  # (buffer, nbytes)
+        self._queued = 0  # bytes queued or being written
+        self._cond = threading.Condition()
+        self._error: Optional[BaseException] = None
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                b, nbytes = self._queue.popleft()
+            try:
+                with memoryview(b) as mv, mv.cast("B") as data:
+                    while data:
+                        data = data[self.raw.write(data) or 0 :]
+            except BaseException as e:
+                with self._cond:
+                    self._error = e
+                    self._queue.clear()
+                    self._queued = 0
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._queued -= nbytes
+                self._cond.notify_all()
+
+    def _raise_error(self):
+        # condition lock must be held
+        if self._error is not None:
+            e, self._error = self._error, None
+            raise e
+
+    def _submit(self, b, nbytes: int):
+        with self._cond:
+            while self._queued and self._queued + nbytes > self.high_water:
+                self._cond.wait()
+            self._raise_error()
+            self._queue.append((b, nbytes))
+            self._queued += nbytes
+            self._cond.notify_all()
+
+    def _submit_pending(self):
+        if self._pending:
+            b, self._pending = self._pending, bytearray()
+            self._submit(b, len(b))
+
+    def readable(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def fileno(self) -> int:
+        return self.raw.fileno()
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    def write(self, b) -> int:
+        """Queue bytes-like object ``b`` to be written, return its size in bytes"""
+        self._checkClosed()
+        with memoryview(b) as mv:
+            nbytes = mv.nbytes
+        if nbytes < self.coalesce_size:
+            self._pending += b
+            if len(self._pending) >= self.coalesce_size:
+                self._submit_pending()
+        elif nbytes:
+            self._submit_pending()
+            self._submit(b, nbytes)
+        return nbytes
+
+    def flush(self):
+        """Hand over combined small writes to the writer thread without waiting"""
+        self._checkClosed()
+        self._submit_pending()
+
+    def drain(self):
+        """Block until all the data is written to the raw stream"""
+        self.flush()
+        with self._cond:
+            while self._queued and self._error is None:
+                self._cond.wait()
+            self._raise_error()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.drain()
+        finally:
+            with self._cond:
+                self._stopping = True
+                self._cond.notify_all()
+            self._thread.join()
+            try:
+                self.raw.close()
+            finally:
+                super().close()
@@ -0,0 +1,32 @@
+"""pipe clients shared by the tests, run in a thread against the server end"""
+
+import time
+
+
+def client_write(pipe_path, data, delay=0.0, chunk_size=None, done=None):
+    """connect after ``delay`` seconds and write ``data``
+
+    With ``chunk_size``, the data is written unbuffered in pieces of that
+    size, so the server sees short reads. ``pipe_path`` may also be a file
+    descriptor, which is closed. ``done`` is an event set once disconnected.
+    """
+    time.sleep(delay)
+    if chunk_size is None:
+        with open(pipe_path, "wb") as f:
+            f.write(data)
+    else:
+        with open(pipe_path, "wb", buffering=0) as f:
+            for i in range(0, len(data), chunk_size):
+                f.write(data[i : i + chunk_size])
+    if done is not None:
+        done.set()
+
+
+def client_read(pipe_path, out, delay=0.0):
+    """connect, wait ``delay`` seconds, and append everything read to ``out``
+
+    The delay lets the server fill the pipe before the client starts reading.
+    """
+    with open(pipe_path, "rb") as f:
+        time.sleep(delay)
+        out.append(f.read())
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_read, client_write
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+
+def test_wait_async_read():
+    msg = b"hello async reader!!"
+
+    async def main():
+        with npipe.NPopen("r") as pipe:
+            t = threading.Thread(target=client_write, args=(pipe.path, msg))
+            t.start()
+            reader = await pipe.wait_async()
+            rmsg = await reader.read()
+            t.join()
+        return rmsg
+
+    assert asyncio.run(main()) == msg
+
+
+def test_wait_async_write():
+    msg = b"hello async writer!!"
+    out = []
+
+    async def main():
+        with npipe.NPopen("w") as pipe:
+            t = threading.Thread(target=client_read, args=(pipe.path, out))
+            t.start()
+            writer = await pipe.wait_async()
+            writer.write(msg)
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        t.join()
+
+    asyncio.run(main())
+    assert out == [msg]
+
+
+def test_wait_async_many():
+    n = 50
+
+    async def main():
+        pipes = [npipe.NPopen("r") for _ in range(n)]
+        try:
+            threads = [
+                threading.Thread(target=client_write, args=(p.path, str(i).encode()))
+                for i, p in enumerate(pipes)
+            ]
+            for t in threads:
+                t.start()
+            readers = await asyncio.gather(*(p.wait_async() for p in pipes))
+            data = await asyncio.gather(*(r.read() for r in readers))
+            for t in threads:
+                t.join()
+        finally:
+            for p in pipes:
+                p.close()
+        return data
+
+    assert asyncio.run(main()) == [str(i).encode() for i in range(n)]
+
+
+def test_wait_async_text_mode():
+    async def main():
+        with npipe.NPopen("rt") as pipe:
+            await pipe.wait_async()
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "mode, kwargs",
+    [
+        ("r", {"bufsize": 0}),
+        ("r", {"stats": True}),
+        ("r", {"readahead": 2}),
+        ("w", {"writebehind": 1 << 16}),
+    ],
+)
+def test_wait_async_unsupported_options(mode, kwargs):
+    async def main():
+        with npipe.NPopen(mode, **kwargs) as pipe:
+            await pipe.wait_async()
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
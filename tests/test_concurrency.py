@@ -0,0 +1,64 @@
+import multiprocessing as mp
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import namedpipe as npipe
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+
+def churn_pipes(n):
+    paths = []
+    for _ in range(n):
+        with npipe.NPopen() as pipe:
+            assert os.path.exists(pipe.path)
+            paths.append(pipe.path)
+    return paths
+
+
+def hold_pipes(n):
+    pipes = [npipe.NPopen() for _ in range(n)]
+    paths = [p.path for p in pipes]
+    for p in pipes:
+        p.close()
+    return paths
+
+
+def test_threads_stress():
+    nthreads, npipes = 16, 250
+    with ThreadPoolExecutor(nthreads) as pool:
+        results = list(pool.map(churn_pipes, [npipes] * nthreads))
+        held = list(pool.map(hold_pipes, [npipes // 5] * nthreads))
+
+    assert sum(len(r) for r in results) == nthreads * npipes
+    # pipes alive at the same time never share a path
+    assert len({p for r in held for p in r}) == nthreads * (npipes // 5)
+    # temporary directories are gone once all pipes are closed
+    dirs = {os.path.dirname(p) for r in results + held for p in r}
+    assert not any(os.path.exists(d) for d in dirs)
+
+
+def worker_fork(n):
+    return os.getpid(), hold_pipes(n)
+
+
+@pytest.mark.skipif(
+    "fork" not in mp.get_all_start_methods(), reason="fork start method unavailable"
+)
+def test_fork_stress():
+    with npipe.NPopen() as parent_pipe:
+        parent_dir = os.path.dirname(parent_pipe.path)
+
+        ctx = mp.get_context("fork")
+        with ctx.Pool(8) as pool:
+            results = pool.map(worker_fork, [200] * 32)
+
+        # children use their own temporary directory, parent's is intact
+        child_dirs = {os.path.dirname(p) for _, paths in results for p in paths}
+        assert parent_dir not in child_dirs
+        assert os.path.exists(parent_pipe.path)
+
+    assert sum(len(paths) for _, paths in results) == 32 * 200
+    assert not os.path.exists(parent_dir)
@@ -0,0 +1,79 @@
+import os
+import socket
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+
+def client_echo(pipe_path, upper=False):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(pipe_path)
+        with sock.makefile("rwb") as f:
+            for line in f:
+                f.write(line.upper() if upper else line)
+                f.flush()
+
+
+@pytest.mark.parametrize("bufsize", [-1, 0])
+def test_duplex_echo(bufsize):
+    with npipe.NPopen("r+", bufsize) as pipe:
+        assert pipe.readable() and pipe.writable()
+        t = threading.Thread(target=client_echo, args=(pipe.path,))
+        t.start()
+        f = pipe.wait()
+        for i in range(100):
+            f.write(b"request %d\n" % i)
+            f.flush()
+            assert f.readline() == b"request %d\n" % i
+        pipe.close()
+        t.join()
+
+
+def test_duplex_text():
+    with npipe.NPopen("r+t", encoding="utf-8", pipe_size=1 << 16) as pipe:
+        t = threading.Thread(target=client_echo, args=(pipe.path, True))
+        t.start()
+        f = pipe.wait()
+        f.write("héllo\n")
+        f.flush()
+        assert f.readline() == "HéLLO\n"  # bytes.upper() is ASCII only
+        pipe.close()
+        t.join()
+    assert not os.path.exists(pipe.path)
+
+
+def test_duplex_wait_timeout():
+    with npipe.NPopen("r+") as pipe:
+        with pytest.raises(TimeoutError):
+            pipe.wait(timeout=0.1)
+
+        t = threading.Thread(target=client_echo, args=(pipe.path,))
+        t.start()
+        f = pipe.wait(timeout=5)
+        f.write(b"again\n")
+        f.flush()
+        assert f.readline() == b"again\n"
+        pipe.close()
+        t.join()
+
+
+def test_duplex_close_cancels_wait():
+    pipe = npipe.NPopen("r+")
+    errors = []
+
+    def wait():
+        try:
+            pipe.wait()
+        except RuntimeError as e:
+            errors.append(e)
+
+    t = threading.Thread(target=wait)
+    t.start()
+    t.join(0.1)
+    pipe.close()
+    t.join(5)
+    assert not t.is_alive() and len(errors) == 1
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+FRAME_SIZE = 320 * 240 * 3
+NFRAMES = 10
+
+
+def client_write_frames(pipe_path, nframes, extra=b""):
+    with open(pipe_path, "wb") as f:
+        for i in range(nframes):
+            # write frames in odd-sized pieces to produce short reads
+            frame = bytes([i]) * FRAME_SIZE
+            for j in range(0, FRAME_SIZE, 10007):
+                f.write(frame[j : j + 10007])
+                f.flush()
+        f.write(extra)
+
+
+@pytest.mark.parametrize("bufsize", [-1, 0])
+def test_frame_reader(bufsize):
+    with npipe.NPopen("r", bufsize=bufsize) as pipe:
+        t = threading.Thread(target=client_write_frames, args=(pipe.path, NFRAMES))
+        t.start()
+        reader = npipe.FrameReader(pipe.wait(), FRAME_SIZE, nbuffers=3)
+        frames = [bytes(frame) for frame in reader]
+        t.join()
+
+    assert frames == [bytes([i]) * FRAME_SIZE for i in range(NFRAMES)]
+
+
+def test_frame_reader_ring_reuse():
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(target=client_write_frames, args=(pipe.path, 4))
+        t.start()
+        reader = npipe.FrameReader(pipe.wait(), FRAME_SIZE, nbuffers=2)
+        f0, f1, f2 = reader.read(), reader.read(), reader.read()
+        assert f0.obj is f2.obj  # same underlying buffer
+        assert f1[0] == 1 and f2[0] == 2
+        assert reader.read()[0] == 3
+        assert reader.read() is None
+        t.join()
+
+
+def test_frame_reader_readinto():
+    buf = bytearray(FRAME_SIZE)
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(target=client_write_frames, args=(pipe.path, 2))
+        t.start()
+        reader = npipe.FrameReader(pipe.wait(), FRAME_SIZE)
+        assert reader.readinto(buf) and buf[0] == 0
+        assert reader.readinto(buf) and buf[-1] == 1
+        assert not reader.readinto(buf)
+        t.join()
+
+
+def test_frame_reader_partial():
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(
+            target=client_write_frames, args=(pipe.path, 1, b"partial")
+        )
+        t.start()
+        reader = npipe.FrameReader(pipe.wait(), FRAME_SIZE)
+        assert reader.read() is not None
+        with pytest.raises(EOFError):
+            reader.read()
+        t.join()
+
+
+def test_frame_reader_numpy():
+    np = pytest.importorskip("numpy")
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(target=client_write_frames, args=(pipe.path, 2))
+        t.start()
+        reader = npipe.FrameReader(
+            pipe.wait(), FRAME_SIZE, dtype=np.uint8, shape=(240, 320, 3)
+        )
+        frames = [frame.copy() for frame in reader]
+        t.join()
+
+    assert len(frames) == 2
+    assert frames[1].shape == (240, 320, 3) and (frames[1] == 1).all()
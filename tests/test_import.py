@@ -0,0 +1,57 @@
+import os
+import re
+import subprocess as sp
+import sys
+
+import pytest
+
+import namedpipe as npipe
+
+# budget of the cumulative import time of the namedpipe package, including
+# the stdlib modules it pulls in (typing, threading, etc.)
+IMPORT_BUDGET_MS = 40
+
+# modules which the package must not import until a feature needs them
+HEAVY_MODULES = [
+    "asyncio",
+    "multiprocessing",
+    "selectors",
+    "shutil",
+    "subprocess",
+    "tempfile",
+    "typing_extensions",
+]
+
+
+def run_python(*args):
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    return sp.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def test_import_defers_heavy_modules():
+    out = run_python(
+        "-c", "import sys, namedpipe; print(' '.join(sys.modules))"
+    ).stdout.split()
+    assert "namedpipe" in out
+    assert [m for m in HEAVY_MODULES if m in out] == []
+
+
+def test_import_time():
+    run_python("-c", "import namedpipe")  # populate bytecode cache
+
+    def import_time_us():
+        err = run_python("-X", "importtime", "-c", "import namedpipe").stderr
+        return int(re.search(r"\|\s*(\d+) \| namedpipe$", err, re.M)[1])
+
+    best = min(import_time_us() for _ in range(3))
+    assert best / 1e3 < IMPORT_BUDGET_MS
+
+
+def test_lazy_attributes():
+    for name in npipe.__all__:
+        assert getattr(npipe, name) is not None
+    assert set(npipe.__all__) <= set(dir(npipe))
+    with pytest.raises(AttributeError):
+        npipe.NoSuchThing
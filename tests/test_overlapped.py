@@ -0,0 +1,254 @@
+import ctypes
+import io
+import os
+from collections import deque
+
+import pytest
+
+from namedpipe import _overlapped
+from namedpipe._overlapped import OverlappedQueue, OverlappedRawIO, connect
+
+ERROR_BROKEN_PIPE = 109
+ERROR_NO_DATA = 232
+ERROR_OPERATION_ABORTED = 995
+ERROR_IO_PENDING = 997
+
+HANDLE = 7
+
+
+class FakeKernel32:
+    """kernel32 stand-in serving overlapped requests on a simulated byte pipe
+
+    Requests complete in the order issued, when their result is collected by
+    GetOverlappedResult(). ``chunks`` are the client writes to be read, and
+    the client closes its end after the last one.
+    """
+
+    def __init__(self, chunks=(), immediate=False, reader_closed=False):
+        self.chunks = deque(chunks)
+        self.immediate = immediate  # requests complete within the call
+        self.reader_closed = reader_closed
+        self.written = bytearray()
+        self.error = 0
+        self.ops = deque()  # outstanding (key, op)
+        self.results = {}  # key -> (ok, nbytes, error) of completed requests
+        self.max_pending = 0
+        self.events = set()
+        self.closed = []
+        self._handles = iter(range(100, 1000))
+
+    def CreateEventW(self, attrs, manual_reset, initial_state, name):
+        assert manual_reset and not initial_state
+        event = next(self._handles)
+        self.events.add(event)
+        return event
+
+    def CloseHandle(self, handle):
+        self.events.discard(handle)
+        self.closed.append(handle)
+        return 1
+
+    def _perform(self, op):
+        kind, buf, size = op
+        if kind == "write":
+            if self.reader_closed:
+                return 0, 0, ERROR_NO_DATA
+            self.written += buf.raw[:size]
+            return 1, size, 0
+        if not self.chunks:
+            return 0, 0, ERROR_BROKEN_PIPE
+        data = self.chunks.popleft()
+        if len(data) > size:
+            self.chunks.appendleft(data[size:])
+            data = data[:size]
+        ctypes.memmove(buf, data, len(data))
+        return 1, len(data), 0
+
+    def _issue(self, ov, op):
+        key = ctypes.addressof(ov._obj)
+        assert key not in self.results and all(k != key for k, _ in self.ops)
+        if self.immediate and not self.ops:
+            ok, nbytes, self.error = result = self._perform(op)
+            if ok:  # a failed call has no completion to collect
+                self.results[key] = result
+            return ok
+        self.ops.append((key, op))
+        self.max_pending = max(self.max_pending, len(self.ops))
+        self.error = ERROR_IO_PENDING
+        return 0
+
+    def ReadFile(self, handle, buf, size, nread, ov):
+        assert handle == HANDLE and nread is None
+        return self._issue(ov, ("read", buf, size))
+
+    def WriteFile(self, handle, buf, size, nwritten, ov):
+        assert handle == HANDLE and nwritten is None
+        return self._issue(ov, ("write", buf, size))
+
+    def ConnectNamedPipe(self, handle, ov):
+        self.results[ctypes.addressof(ov._obj)] = (1, 0, 0)
+        self.error = ERROR_IO_PENDING
+        return 0
+
+    def GetOverlappedResult(self, handle, ov, nbytes, wait):
+        assert wait
+        key = ctypes.addressof(ov._obj)
+        while key not in self.results:
+            k, op = self.ops.popleft()  # earlier requests complete first
+            self.results[k] = self._perform(op)
+        ok, nbytes._obj.value, self.error = self.results.pop(key)
+        return ok
+
+    def CancelIoEx(self, handle, ov):
+        key = ctypes.addressof(ov._obj)
+        for i, (k, _) in enumerate(self.ops):
+            if k == key:
+                del self.ops[i]
+                self.results[key] = (0, 0, ERROR_OPERATION_ABORTED)
+                return 1
+        return 0
+
+
+@pytest.fixture
+def patch_kernel32(monkeypatch):
+    def patch(kernel32):
+        monkeypatch.setattr(_overlapped, "_kernel32", lambda: kernel32)
+        monkeypatch.setattr(_overlapped, "_last_error", lambda: kernel32.error)
+        monkeypatch.setattr(
+            _overlapped, "_win_error", lambda code=None: OSError(code, "error")
+        )
+        return kernel32
+
+    return patch
+
+
+def split(data, sizes):
+    chunks, i = [], 0
+    for n in sizes:
+        chunks.append(data[i : i + n])
+        i += n
+    return chunks + [data[i:]]
+
+
+def test_queue_completes_in_order(patch_kernel32):
+    kernel32 = patch_kernel32(FakeKernel32([b"a", b"bb", b"ccc", b"dddd"]))
+    q = OverlappedQueue(HANDLE, 3, 16)
+    assert [q.submit_read() for _ in range(4)] == [True, True, True, False]
+    assert (q.pending, q.free, kernel32.max_pending) == (3, 0, 3)
+    req, n = q.complete()
+    assert bytes(req.view[:n]) == b"a"
+    q.release(req)
+    assert q.submit_read()
+    for expected in [b"bb", b"ccc", b"dddd"]:
+        req, n = q.complete()
+        assert bytes(req.view[:n]) == expected
+        q.release(req)
+    assert q.submit_read()
+    with pytest.raises(BrokenPipeError):
+        q.complete()  # the client is gone
+    assert (q.pending, q.free) == (0, 3)
+    q.close()
+    assert q.pending == 0 and kernel32.events == set()
+
+
+@pytest.mark.parametrize("immediate", [False, True])
+def test_read(patch_kernel32, immediate):
+    data = os.urandom(100_000)
+    chunks = split(data, [10, 4096, 0, 30_000, 1, 1000])
+    kernel32 = patch_kernel32(FakeKernel32(chunks, immediate=immediate))
+    raw = OverlappedRawIO(HANDLE, True, False, depth=4, size=8192)
+    with io.BufferedReader(raw, 5000) as f:
+        assert f.read() == data
+        assert f.read() == b""
+    assert kernel32.max_pending <= 4
+    assert kernel32.ops == deque() and kernel32.results == {}
+    assert kernel32.events == set() and HANDLE in kernel32.closed
+
+
+def test_read_exact(patch_kernel32):
+    data = os.urandom(50_000)
+    patch_kernel32(FakeKernel32(split(data, [7000, 7000])))
+    with OverlappedRawIO(HANDLE, True, False, depth=2, size=4096) as raw:
+        buf = bytearray(30_000)
+        assert raw.readinto_exact(buf) == 30_000 and buf == data[:30_000]
+        assert raw.readinto_exact(buf) == 20_000 and buf[:20_000] == data[30_000:]
+
+
+def test_close_cancels_reads(patch_kernel32):
+    kernel32 = patch_kernel32(FakeKernel32([b"x" * 100] * 10))
+    raw = OverlappedRawIO(HANDLE, True, False, depth=3, size=100)
+    assert raw.read(10) == b"x" * 10
+    assert len(kernel32.ops) == 2  # issued ahead of the consumer
+    raw.close()
+    # every request is finished before its buffer and event are freed
+    assert kernel32.ops == deque() and kernel32.results == {}
+    assert kernel32.events == set()
+    assert len(kernel32.chunks) == 9  # cancelled reads took nothing
+    with pytest.raises(ValueError):
+        raw.read(10)
+
+
+@pytest.mark.parametrize("immediate", [False, True])
+def test_write(patch_kernel32, immediate):
+    data = os.urandom(100_000)
+    kernel32 = patch_kernel32(FakeKernel32(immediate=immediate))
+    raw = OverlappedRawIO(HANDLE, False, True, depth=3, size=4096)
+    with io.BufferedWriter(raw, 1000) as f:
+        for chunk in split(data, [1, 10_000, 500, 20_000]):
+            f.write(chunk)
+        f.flush()
+        raw.flush()
+        assert kernel32.ops == deque()  # raw flush waits for the outstanding writes
+        assert kernel32.written == data
+    assert kernel32.max_pending <= 3
+    assert kernel32.events == set() and HANDLE in kernel32.closed
+
+
+def test_write_returns_before_completion(patch_kernel32):
+    kernel32 = patch_kernel32(FakeKernel32())
+    with OverlappedRawIO(HANDLE, False, True, depth=2, size=10) as raw:
+        assert raw.write(b"0123456789abc") == 10
+        assert raw.write(memoryview(b"abc")) == 3
+        assert len(kernel32.ops) == 2 and kernel32.written == b""
+        assert raw.write(b"def") == 3  # waits for the first write
+        assert kernel32.written == b"0123456789"
+    assert kernel32.written == b"0123456789abcdef"
+
+
+def test_write_error(patch_kernel32):
+    kernel32 = patch_kernel32(FakeKernel32(reader_closed=True))
+    raw = OverlappedRawIO(HANDLE, False, True, depth=2, size=10)
+    raw.write(b"spam")  # issued, fails asynchronously
+    with pytest.raises(BrokenPipeError):
+        raw.flush()
+    with pytest.raises(BrokenPipeError):
+        for _ in range(3):
+            raw.write(b"eggs")  # the third waits for the first
+    with pytest.raises(BrokenPipeError):
+        raw.close()  # the second failed too
+    assert raw.closed
+    assert kernel32.ops == deque() and kernel32.events == set()
+
+
+def test_duplex(patch_kernel32):
+    kernel32 = patch_kernel32(FakeKernel32([b"ping"]))
+    with OverlappedRawIO(HANDLE, True, True, depth=2, size=64) as raw:
+        assert raw.readable() and raw.writable() and not raw.seekable()
+        assert raw.read(64) == b"ping"
+        raw.write(b"pong")
+        raw.flush()
+        assert raw.read(64) == b""
+    assert kernel32.written == b"pong"
+    assert kernel32.events == set()
+
+
+def test_connect(patch_kernel32):
+    kernel32 = patch_kernel32(FakeKernel32())
+    connect(HANDLE)
+    assert kernel32.results == {} and kernel32.events == set()
+
+
+def test_invalid_depth(patch_kernel32):
+    patch_kernel32(FakeKernel32())
+    with pytest.raises(ValueError):
+        OverlappedQueue(HANDLE, 0)
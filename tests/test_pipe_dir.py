@@ -0,0 +1,81 @@
+import os
+import subprocess as sp
+import sys
+
+import pytest
+
+import namedpipe as npipe
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    yield str(tmp_path)
+    npipe.configure(clean_stale=False)  # restore defaults
+
+
+def test_configure_dir(base_dir):
+    npipe.configure(base_dir)
+    with npipe.NPopen("r") as pipe:
+        pipe_dir = os.path.dirname(pipe.path)
+        assert os.path.dirname(pipe_dir) == base_dir
+        assert os.path.basename(pipe_dir).startswith(f"pipe{os.getpid()}-")
+    assert not os.path.exists(pipe_dir)  # removed with the last pipe
+
+
+def test_configure_keep(base_dir):
+    npipe.configure(base_dir, keep=True)
+    with npipe.NPopen("r") as pipe:
+        pipe_dir = os.path.dirname(pipe.path)
+    assert os.path.isdir(pipe_dir)
+    with npipe.NPopen("w") as pipe:
+        assert os.path.dirname(pipe.path) == pipe_dir  # reused
+
+    with npipe.NPopen("r") as pipe:
+        with pytest.raises(RuntimeError):
+            npipe.configure(base_dir)
+    npipe.configure(base_dir)  # removes the kept directory
+    assert not os.path.exists(pipe_dir)
+
+
+def test_configure_keep_removed_at_exit(base_dir):
+    code = (
+        "import namedpipe as npipe\n"
+        f"npipe.configure({base_dir!r}, keep=True)\n"
+        "npipe.NPopen('r').close()\n"
+    )
+    sp.run([sys.executable, "-c", code], check=True)
+    assert os.listdir(base_dir) == []
+
+
+@pytest.mark.parametrize("modes", [["r", "r", "w"], ["r+", "r"]])
+def test_configure_clean_stale(base_dir, modes):
+    # leave pipe directories behind as a crashed worker would
+    code = (
+        "import os, namedpipe as npipe\n"
+        f"npipe.configure({base_dir!r})\n"
+        f"pipes = [npipe.NPopen(mode) for mode in {modes!r}]\n"
+        "os._exit(0)\n"
+    )
+    sp.run([sys.executable, "-c", code], check=True)
+    (stale,) = os.listdir(base_dir)
+    assert len(os.listdir(os.path.join(base_dir, stale))) == len(modes)
+    other = stale.partition("-")[0] + "-other"
+    os.mkdir(os.path.join(base_dir, other))
+    open(os.path.join(base_dir, other, "file"), "w").close()  # not a pipe
+
+    assert npipe.configure(base_dir, clean_stale=False) == 0
+    assert npipe.configure(base_dir) == 1
+    assert os.listdir(base_dir) == [other]
+
+    from namedpipe._posix import _remove_stale_tempdirs
+
+    with npipe.NPopen("r") as pipe:  # directory of a live process
+        assert _remove_stale_tempdirs(base_dir) == 0
+        assert os.path.exists(pipe.path)
+
+
+def test_configure_invalid_dir(base_dir):
+    with pytest.raises(NotADirectoryError):
+        npipe.configure(os.path.join(base_dir, "missing"))
@@ -0,0 +1,40 @@
+import sys
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_write
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="F_SETPIPE_SZ is Linux only"
+)
+
+
+def test_pipe_size():
+    msg = b"x" * 1_000_000
+    with npipe.NPopen("r", pipe_size=1 << 18) as pipe:
+        assert pipe.pipe_size is None  # not connected yet
+        t = threading.Thread(target=client_write, args=(pipe.path, msg))
+        t.start()
+        stream = pipe.wait()
+        assert pipe.pipe_size == 1 << 18
+        assert stream.read() == msg
+        t.join()
+
+
+def test_pipe_size_capped():
+    with open("/proc/sys/fs/pipe-max-size") as f:
+        max_size = int(f.read())
+    with npipe.NPopen("r", pipe_size=max_size * 4) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, b""))
+        t.start()
+        pipe.wait()
+        assert pipe.pipe_size == max_size
+        t.join()
+
+
+def test_pipe_size_invalid():
+    with pytest.raises(ValueError):
+        npipe.NPopen("r", pipe_size=0)
@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_write
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+
+def test_pool_recycle():
+    with npipe.PipePool(min_size=2) as pool:
+        assert len(pool) == 2
+        paths = set()
+        for i in range(5):
+            msg = f"job {i}".encode()
+            with pool.acquire("r") as pipe:
+                paths.add(pipe.path)
+                t = threading.Thread(target=client_write, args=(pipe.path, msg))
+                t.start()
+                assert pipe.wait().read() == msg
+                t.join()
+            assert os.path.exists(pipe.path)  # not deleted on close
+        assert len(paths) == 1
+        assert len(pool) == 2
+    assert not any(os.path.exists(p) for p in paths)
+
+
+def test_pool_grow_and_max_size():
+    with npipe.PipePool(max_size=2) as pool:
+        pipes = [pool.acquire("w") for _ in range(4)]
+        assert len({p.path for p in pipes}) == 4
+        for p in pipes:
+            p.close()
+            p.close()  # no double release
+        assert len(pool) == 2
+        assert sum(os.path.exists(p.path) for p in pipes) == 2
+
+
+def test_pool_idle_eviction():
+    with npipe.PipePool(min_size=1, idle_timeout=0.05) as pool:
+        pipes = [pool.acquire() for _ in range(3)]
+        for p in pipes:
+            p.close()
+        assert len(pool) == 3
+        time.sleep(0.1)
+        pool.acquire().close()
+        assert len(pool) == 1
+
+
+def test_pool_closed():
+    pool = npipe.PipePool()
+    pipe = pool.acquire()
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    pipe.close()
+    assert not os.path.exists(pipe.path)
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_write
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="clients use threads on POSIX")
+
+DATA = os.urandom(2_000_000)
+
+
+@pytest.mark.parametrize("bufsize", [-1, 0])
+def test_readahead(bufsize):
+    with npipe.NPopen("r", bufsize=bufsize, readahead=4) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, DATA))
+        t.start()
+        stream = pipe.wait()
+        chunks = []
+        while chunk := stream.read(100_000):
+            chunks.append(chunk)
+        t.join()
+    assert b"".join(chunks) == DATA
+
+
+def test_readahead_unblocks_writer():
+    # writer finishes while the reader is idle, as long as the data fits the queue
+    msg = os.urandom(4 * 65536 + 65536)  # queue + kernel pipe
+    done = threading.Event()
+    with npipe.NPopen("r", readahead=4) as pipe:
+        t = threading.Thread(
+            target=client_write, args=(pipe.path, msg), kwargs={"done": done}
+        )
+        t.start()
+        stream = pipe.wait()
+        assert done.wait(timeout=5)
+        assert stream.read() == msg
+        t.join()
+
+
+def test_readahead_backpressure():
+    done = threading.Event()
+    with npipe.NPopen("r", readahead=2) as pipe:
+        t = threading.Thread(
+            target=client_write, args=(pipe.path, DATA), kwargs={"done": done}
+        )
+        t.start()
+        stream = pipe.wait()
+        time.sleep(0.2)
+        assert not done.is_set()  # queue and kernel pipe are full
+        assert stream.read() == DATA
+        t.join()
+
+
+def test_readahead_text():
+    with npipe.NPopen("rt", readahead=2, stats=True) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, b"a\nb\n"))
+        t.start()
+        assert pipe.wait().readlines() == ["a\n", "b\n"]
+        t.join()
+    assert pipe.stats.bytes_read == 4
+
+
+def test_readahead_close_early():
+    with npipe.NPopen("r", readahead=2) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, b"x" * 100))
+        t.start()
+        assert pipe.wait().read(10) == b"x" * 10
+    t.join()
+
+
+def test_readahead_write_mode():
+    with pytest.raises(ValueError):
+        npipe.NPopen("w", readahead=2)
+
+
+@pytest.mark.parametrize("bufsize", [-1, 0])
+def test_readahead_pump_to(tmp_path, bufsize):
+    with npipe.NPopen("r", bufsize=bufsize, readahead=2) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, DATA))
+        t.start()
+        stream = pipe.wait()
+        with open(tmp_path / "out.bin", "wb") as f, pytest.raises(ValueError):
+            pipe.pump_to(f)  # would bypass the data queued by the thread
+        assert stream.read() == DATA
+        t.join()
+
+
+def test_readahead_tee():
+    with npipe.NPopen("r", readahead=2) as pipe, open(os.devnull, "wb") as f:
+        t = threading.Thread(target=client_write, args=(pipe.path, DATA))
+        t.start()
+        stream = pipe.wait()
+        with pytest.raises(ValueError):
+            npipe.PipeTee(pipe, [f]).run()
+        assert stream.read() == DATA
+        t.join()
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+
+def progress_block(i, final=False):
+    return (
+        f"frame={i}\nfps=25.00\nbitrate= 512.0kbits/s\nout_time_us={i * 40000}\n"
+        f"speed=1.00x\nprogress={'end' if final else 'continue'}\n"
+    ).encode()
+
+
+def client_write_progress(pipe_path, nblocks, extra=b""):
+    data = b"".join(progress_block(i, i == nblocks - 1) for i in range(nblocks))
+    with open(pipe_path, "wb") as f:
+        # odd-sized pieces split lines and blocks across reads
+        for j in range(0, len(data), 37):
+            f.write(data[j : j + 37])
+            f.flush()
+        f.write(extra)
+
+
+@pytest.mark.parametrize("mode,bufsize", [("r", 0), ("r", -1), ("rt", -1)])
+def test_progress_reader(mode, bufsize):
+    with npipe.NPopen(mode, bufsize) as pipe:
+        t = threading.Thread(target=client_write_progress, args=(pipe.path, 100))
+        t.start()
+        blocks = list(npipe.ProgressReader(pipe.wait(), chunk_size=100))
+        t.join()
+
+    assert len(blocks) == 100
+    assert blocks[0] == {
+        "frame": "0",
+        "fps": "25.00",
+        "bitrate": "512.0kbits/s",
+        "out_time_us": "0",
+        "speed": "1.00x",
+        "progress": "continue",
+    }
+    assert blocks[-1]["frame"] == "99" and blocks[-1]["progress"] == "end"
+
+
+def test_progress_reader_keys():
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(
+            target=client_write_progress, args=(pipe.path, 3, b"frame=3\nfps=")
+        )
+        t.start()
+        reader = npipe.ProgressReader(pipe.wait(), keys=["frame"])
+        assert reader.read() == {"frame": "0", "progress": "continue"}
+        assert [block["frame"] for block in reader] == ["1", "2"]
+        assert reader.read() is None  # incomplete last block is dropped
+        t.join()
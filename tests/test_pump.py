@@ -0,0 +1,100 @@
+import os
+import socket
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_read, client_write
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+DATA = os.urandom(3_000_000)
+
+
+@pytest.mark.parametrize("bufsize", [-1, 0])
+def test_pump_to_file(tmp_path, bufsize):
+    dst = tmp_path / "out.bin"
+    with npipe.NPopen("r", bufsize=bufsize) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, DATA))
+        t.start()
+        stream = pipe.wait()
+        head = stream.read(10)  # leaves data in the stream buffer
+        with open(dst, "wb") as f:
+            f.write(head)
+            assert pipe.pump_to(f) == len(DATA) - 10
+        t.join()
+    assert dst.read_bytes() == DATA
+
+
+def test_pump_to_nbytes(tmp_path):
+    dst = tmp_path / "out.bin"
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, DATA))
+        t.start()
+        stream = pipe.wait()
+        with open(dst, "wb") as f:
+            assert pipe.pump_to(f.fileno(), 1_000_000) == 1_000_000
+        assert stream.read() == DATA[1_000_000:]
+        t.join()
+    assert dst.read_bytes() == DATA[:1_000_000]
+
+
+def test_pump_to_socket():
+    a, b = socket.socketpair()
+    out = []
+
+    def recv_all():
+        with b:
+            out.append(b"".join(iter(lambda: b.recv(1 << 16), b"")))
+
+    r = threading.Thread(target=recv_all)
+    r.start()
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, DATA))
+        t.start()
+        pipe.wait()
+        with a:
+            assert pipe.pump_to(a) == len(DATA)
+        t.join()
+    r.join()
+    assert out == [DATA]
+
+
+@pytest.mark.parametrize("zerocopy", [True, False])
+def test_pump_from_file(tmp_path, monkeypatch, zerocopy):
+    if not zerocopy:
+        monkeypatch.delattr(os, "splice", raising=False)
+        monkeypatch.delattr(os, "sendfile", raising=False)
+    src = tmp_path / "in.bin"
+    src.write_bytes(DATA)
+    out = []
+    with npipe.NPopen("w") as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out))
+        t.start()
+        stream = pipe.wait()
+        stream.write(b"head")
+        with open(src, "rb") as f:
+            assert pipe.pump_from(f) == len(DATA)
+        stream.close()
+        t.join()
+    assert out == [b"head" + DATA]
+
+
+def test_pump_not_connected():
+    with npipe.NPopen("r") as pipe:
+        with pytest.raises(RuntimeError):
+            pipe.pump_to(1)
+
+
+def test_pump_wrong_mode():
+    with npipe.NPopen("rt") as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, b""))
+        t.start()
+        pipe.wait()
+        with pytest.raises(ValueError):
+            pipe.pump_to(1)
+        with pytest.raises(ValueError):
+            pipe.pump_from(0)
+        t.join()
@@ -0,0 +1,70 @@
+import os
+import threading
+import time
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_write
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="clients use threads on POSIX")
+
+DATA = os.urandom(1_000_000)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"stats": True}, {"readahead": 2}])
+def test_readinto_exact(kwargs):
+    buf = bytearray(300_000)
+    with npipe.NPopen("r", bufsize=0, **kwargs) as pipe:
+        t = threading.Thread(
+            target=client_write, args=(pipe.path, DATA), kwargs={"chunk_size": 10007}
+        )
+        t.start()
+        stream = pipe.wait()
+        chunks = []
+        while n := stream.readinto_exact(buf):
+            chunks.append(bytes(buf[:n]))
+        t.join()
+    assert [len(c) for c in chunks] == [300_000] * 3 + [100_000]
+    assert b"".join(chunks) == DATA
+
+
+def test_readexactly():
+    with npipe.NPopen("r", bufsize=0) as pipe:
+        t = threading.Thread(
+            target=client_write, args=(pipe.path, DATA), kwargs={"chunk_size": 10007}
+        )
+        t.start()
+        stream = pipe.wait()
+        assert stream.readexactly(600_000) == DATA[:600_000]
+        with pytest.raises(EOFError):
+            stream.readexactly(600_000)
+        t.join()
+
+
+def test_unbuffered_text_rejected():
+    with pytest.raises(ValueError):
+        npipe.NPopen("rt", bufsize=0)
+
+
+def test_wait_failure_closes_stack():
+    # a failure in the layers over the raw stream closes it exactly once
+    nthreads = threading.active_count()
+    with npipe.NPopen("rt", encoding="no-such-codec", readahead=2) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, b"data"))
+        t.start()
+        try:
+            pipe.wait()
+        except LookupError:
+            # likely reuses the pipe's fd number, which a stale owner of the
+            # fd would close once the failed stack is freed
+            f = open(os.devnull, "rb")
+        t.join()
+    with f:
+        os.fstat(f.fileno())
+    for _ in range(100):  # read-ahead thread stops
+        if threading.active_count() == nthreads:
+            break
+        time.sleep(0.01)
+    assert threading.active_count() == nthreads
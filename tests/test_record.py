@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+RECORDS = [bytes([i % 256]) * (i * 37) for i in range(200)]
+
+
+def client_write_records(pipe_path, records, extra=b""):
+    with open(pipe_path, "wb") as f:
+        writer = npipe.RecordWriter(f)
+        for i in range(0, len(records), 7):
+            writer.writemany(records[i : i + 7])
+            writer.write(b"")
+        f.write(extra)
+
+
+def client_read_records(pipe_path, out):
+    with open(pipe_path, "rb") as f:
+        out.extend(bytes(record) for record in npipe.RecordReader(f))
+
+
+@pytest.mark.parametrize("bufsize", [-1, 0])
+def test_record_reader(bufsize):
+    with npipe.NPopen("r", bufsize=bufsize) as pipe:
+        t = threading.Thread(target=client_write_records, args=(pipe.path, RECORDS))
+        t.start()
+        records = [bytes(record) for record in npipe.RecordReader(pipe.wait())]
+        t.join()
+
+    assert [r for r in records if r] == [r for r in RECORDS if r]
+    assert len(records) == len(RECORDS) + (len(RECORDS) + 6) // 7
+
+
+@pytest.mark.parametrize("kwargs", [{"bufsize": 0}, {"writebehind": 1 << 20}])
+def test_record_writer(kwargs):
+    out = []
+    with npipe.NPopen("w", **kwargs) as pipe:
+        t = threading.Thread(target=client_read_records, args=(pipe.path, out))
+        t.start()
+        writer = npipe.RecordWriter(pipe.wait())
+        for record in RECORDS:
+            writer.write(record)
+        pipe.close()
+        t.join()
+
+    assert out == RECORDS
+
+
+@pytest.mark.parametrize("bufsize", [-1, 0])
+def test_record_reader_streaming(bufsize):
+    # records are delivered while the writer keeps the pipe open
+    received = threading.Event()
+    waited = []
+
+    def client(pipe_path):
+        with open(pipe_path, "wb", buffering=0) as f:
+            npipe.RecordWriter(f).write(b"streaming")
+            waited.append(received.wait(5))
+
+    with npipe.NPopen("r", bufsize=bufsize) as pipe:
+        t = threading.Thread(target=client, args=(pipe.path,))
+        t.start()
+        reader = npipe.RecordReader(pipe.wait())
+        assert bytes(reader.read()) == b"streaming"
+        received.set()
+        assert reader.read() is None
+        t.join()
+    assert waited == [True]
+
+
+def test_record_reader_readinto():
+    buf = bytearray(1 << 16)
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(target=client_write_records, args=(pipe.path, RECORDS[:3]))
+        t.start()
+        reader = npipe.RecordReader(pipe.wait())
+        assert reader.readinto(buf) == 0
+        assert reader.readinto(buf) == 37 and buf[:37] == RECORDS[1]
+        assert reader.readinto(buf) == 74
+        assert reader.readinto(buf) == 0  # empty record from write(b"")
+        assert reader.readinto(buf) is None
+        t.join()
+
+
+def test_record_reader_errors():
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(
+            target=client_write_records, args=(pipe.path, [b"x" * 100], b"\x05\0")
+        )
+        t.start()
+        reader = npipe.RecordReader(pipe.wait(), max_size=10)
+        with pytest.raises(ValueError):
+            reader.read()
+        t.join()
+
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(
+            target=client_write_records, args=(pipe.path, [b"x"], b"\x05\0\0\0ab")
+        )
+        t.start()
+        reader = npipe.RecordReader(pipe.wait())
+        assert reader.read() == b"x" and reader.read() == b""
+        with pytest.raises(EOFError):
+            reader.read()
+        t.join()
@@ -0,0 +1,80 @@
+import sys
+import threading
+import time
+
+import pytest
+
+import namedpipe as npipe
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="relies on Linux FIFO semantics"
+)
+
+
+def client_write(pipe_path, msgs, delay=0):
+    time.sleep(delay)
+    with open(pipe_path, "wb", buffering=0) as f:
+        for msg in msgs:
+            f.write(msg)
+            time.sleep(0.001)
+
+
+def test_pipe_selector():
+    n = 100
+    pipes = [npipe.NPopen("r") for _ in range(n)]
+    try:
+        with npipe.PipeSelector(pipes, chunk_size=4096) as sel:
+            assert len(sel) == n
+            threads = [
+                threading.Thread(
+                    target=client_write,
+                    args=(p.path, [b"%d:" % i, b"x" * 10000], (n - i) / 1000),
+                )
+                for i, p in enumerate(pipes)
+            ]
+            for t in threads:
+                t.start()
+
+            data = {p: b"" for p in pipes}
+            eofs = set()
+            for pipe, chunk in sel:
+                assert pipe not in eofs
+                assert len(chunk) <= 4096
+                if chunk:
+                    data[pipe] += chunk
+                else:
+                    eofs.add(pipe)
+            for t in threads:
+                t.join()
+    finally:
+        for p in pipes:
+            p.close()
+
+    assert len(eofs) == n
+    assert all(data[p] == b"%d:" % i + b"x" * 10000 for i, p in enumerate(pipes))
+
+
+def test_multiplex_timeout():
+    with npipe.NPopen("r") as pipe:
+        with pytest.raises(TimeoutError):
+            for _ in npipe.multiplex([pipe], timeout=0.1):
+                pass
+
+
+def test_multiplex():
+    pipes = [npipe.NPopen("r") for _ in range(3)]
+    threads = [
+        threading.Thread(target=client_write, args=(p.path, [b"abc"])) for p in pipes
+    ]
+    for t in threads:
+        t.start()
+    try:
+        events = list(npipe.multiplex(pipes, timeout=5))
+    finally:
+        for t in threads:
+            t.join()
+        for p in pipes:
+            p.close()
+    assert sorted(events, key=lambda e: pipes.index(e[0])) == [
+        e for p in pipes for e in [(p, b"abc"), (p, b"")]
+    ]
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+
+import pytest
+
+import namedpipe as npipe
+
+# opens "out" before "in", which deadlocks if the pipes are waited in order
+COPY = """
+import sys
+with open(sys.argv[2], "wb") as out, open(sys.argv[1], "rb") as f:
+    out.write(f.read().upper())
+"""
+
+
+def test_session():
+    args = [sys.executable, "-c", COPY, "{in}", "{out}"]
+    with npipe.PipeSession(args, {"in": "w", "out": "r"}, timeout=10) as session:
+        session.streams["in"].write(b"hello session")
+        session.pipes["in"].close()
+        assert session.streams["out"].read() == b"HELLO SESSION"
+    assert session.proc.returncode == 0
+    assert not any(os.path.exists(p.path) for p in session.pipes.values())
+
+
+def test_session_pipe_kwargs():
+    args = [sys.executable, "-c", COPY, "{in}", "{out}"]
+    pipes = {"in": {"mode": "wt"}, "out": {"mode": "rt", "encoding": "utf-8"}}
+    with npipe.PipeSession(args, pipes, timeout=10) as session:
+        session.streams["in"].write("héllo")
+        session.pipes["in"].close()
+        assert session.streams["out"].read() == "HéLLO"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="wait() cancellation is POSIX only")
+def test_session_early_exit():
+    args = [sys.executable, "-c", "pass", "{in}"]
+    t0 = time.monotonic()
+    session = npipe.PipeSession(args, {"in": "w"})
+    with pytest.raises(RuntimeError):
+        session.start()
+    assert time.monotonic() - t0 < 5
+    assert not os.path.exists(session.pipes["in"].path)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="wait() timeout is POSIX only")
+def test_session_timeout():
+    args = [sys.executable, "-c", "import time; time.sleep(10)", "{in}"]
+    session = npipe.PipeSession(args, {"in": "r"}, timeout=0.2)
+    with pytest.raises(TimeoutError):
+        session.start()
+    assert session.proc.returncode is not None
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses sh")
+def test_session_fast_exit():
+    # the client connects, writes and exits before the session sees it connected
+    for _ in range(50):
+        with npipe.PipeSession(["sh", "-c", "printf hi > {out}"], {"out": "r"}) as s:
+            assert s.streams["out"].read() == b"hi"
+        assert s.proc.returncode == 0
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses sh")
+def test_session_broken_pipe_on_close():
+    # the client exits without reading, so flushing the stream on close fails
+    with pytest.raises(ValueError):
+        with npipe.PipeSession(["sh", "-c", ": < {in}"], {"in": "w"}) as s:
+            s.streams["in"].write(b"unread")
+            s.proc.wait()
+            raise ValueError
+    assert not os.path.exists(s.pipes["in"].path)
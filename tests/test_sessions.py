@@ -0,0 +1,96 @@
+import os
+import socket
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+
+def test_sessions_read():
+    done = threading.Semaphore(0)
+    with npipe.NPopen("r") as pipe:
+        path = pipe.path
+
+        def writers():
+            for i in range(5):
+                done.acquire()  # next writer connects after the session ends
+                with open(path, "wb") as f:
+                    f.write(b"client %d" % i)
+
+        t = threading.Thread(target=writers)
+        t.start()
+        done.release()
+        data = []
+        for stream in pipe.sessions(timeout=1):
+            data.append(stream.read())
+            assert pipe.path == path and os.path.exists(path)
+            stream.close()
+            done.release()
+        t.join()
+
+    assert data == [b"client %d" % i for i in range(5)]
+
+
+def test_sessions_write():
+    out = []
+    done = threading.Semaphore(0)
+    with npipe.NPopen("w") as pipe:
+
+        def readers():
+            for _ in range(3):
+                with open(pipe.path, "rb") as f:
+                    out.append(f.read())
+                done.release()
+
+        t = threading.Thread(target=readers)
+        t.start()
+        for i, stream in enumerate(pipe.sessions()):
+            stream.write(b"session %d" % i)
+            stream.close()
+            done.acquire()  # next session starts after the reader got EOF
+            if i == 2:
+                break
+        t.join()
+
+    assert out == [b"session %d" % i for i in range(3)]
+
+
+def test_sessions_duplex():
+    def client(path, msg, out):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall(msg)
+            sock.shutdown(socket.SHUT_WR)
+            out.append(sock.recv(100))
+
+    with npipe.NPopen("r+") as pipe:
+        outs = [[] for _ in range(4)]
+        # concurrent clients queue up and are served one session each
+        threads = [
+            threading.Thread(target=client, args=(pipe.path, b"%d" % i, out))
+            for i, out in enumerate(outs)
+        ]
+        for t in threads:
+            t.start()
+        for n, stream in enumerate(pipe.sessions(timeout=1), 1):
+            stream.write(b"echo " + stream.read())
+            stream.flush()
+        for t in threads:
+            t.join()
+
+    assert n == 4
+    assert sorted(out[0] for out in outs) == [b"echo %d" % i for i in range(4)]
+
+
+def test_sessions_close():
+    pipe = npipe.NPopen("r")
+    sessions = []
+    t = threading.Thread(target=lambda: sessions.extend(pipe.sessions()))
+    t.start()
+    t.join(0.1)
+    pipe.close()
+    t.join(5)
+    assert not t.is_alive() and sessions == []
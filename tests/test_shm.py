@@ -0,0 +1,122 @@
+import hashlib
+import multiprocessing as mp
+import os
+import subprocess as sp
+import sys
+import threading
+import time
+
+import pytest
+
+import namedpipe as npipe
+
+
+def worker_recv(pipe_path):
+    h = hashlib.sha1()
+    n = 0
+    with npipe.shm_connect(pipe_path, "r") as channel:
+        for msg in channel:
+            h.update(msg)
+            n += 1
+    return n, h.hexdigest()
+
+
+def worker_send(pipe_path, msgs):
+    with npipe.shm_connect(pipe_path, "w") as channel:
+        for msg in msgs:
+            channel.send(msg)
+
+
+def test_shm_send_multiprocessing():
+    ctx = mp.get_context("spawn")
+    msgs = [os.urandom(300_000 + i) for i in range(50)]
+    with ctx.Pool(1) as pool:
+        with npipe.ShmNPopen("w", size=1_000_000) as pipe:
+            result = pool.apply_async(worker_recv, (pipe.path,))
+            channel = pipe.wait()
+            for msg in msgs:  # wraps around the ring many times
+                channel.send(msg)
+            channel.close()
+            n, digest = result.get(timeout=30)
+
+    assert n == len(msgs)
+    assert digest == hashlib.sha1(b"".join(msgs)).hexdigest()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="clients use threads on POSIX")
+def test_shm_recv():
+    msgs = [bytes([i]) * (1000 * i + 1) for i in range(100)]
+    with npipe.ShmNPopen("r", size=100_000) as pipe:
+        t = threading.Thread(target=worker_send, args=(pipe.path, msgs))
+        t.start()
+        received = [bytes(msg) for msg in pipe.wait()]
+        t.join()
+    assert received == msgs
+
+
+def test_shm_too_large():
+    errors = []
+
+    def client(path):
+        try:
+            worker_send(path, [b"x" * 1001])
+        except ValueError as e:
+            errors.append(e)
+
+    with npipe.ShmNPopen("r", size=1000) as pipe:
+        t = threading.Thread(target=client, args=(pipe.path,))
+        t.start()
+        channel = pipe.wait()
+        t.join()
+        assert channel.recv() is None
+    assert len(errors) == 1
+
+
+@pytest.mark.skipif(os.name == "nt", reason="clients use threads on POSIX")
+def test_shm_receiver_gone():
+    errors = []
+
+    def client(path):
+        with npipe.shm_connect(path, "r") as channel:
+            channel.recv()  # the message stays unreleased, the ring full
+
+    def sender(channel):
+        try:
+            for _ in range(10):
+                channel.send(b"x" * 600)
+        except BrokenPipeError as e:
+            errors.append(e)
+
+    with npipe.ShmNPopen("w", size=1024) as pipe:
+        t = threading.Thread(target=client, args=(pipe.path,))
+        t.start()
+        producer = threading.Thread(target=sender, args=(pipe.wait(),))
+        producer.start()
+        t.join()
+        producer.join(timeout=5)
+        assert not producer.is_alive()
+    assert len(errors) == 1
+
+
+@pytest.mark.skipif(
+    not os.path.isdir("/dev/shm"), reason="inspects POSIX shared memory in /dev/shm"
+)
+def test_shm_unlinked_after_crash():
+    # a client in the same process must not drop the creator's registration
+    # with the resource tracker, which unlinks the segment after a crash
+    code = (
+        "import os, threading, namedpipe as npipe\n"
+        "from namedpipe._shm import _shm_name\n"
+        "pipe = npipe.ShmNPopen('r', size=1000)\n"
+        "t = threading.Thread(target=lambda: npipe.shm_connect(pipe.path, 'w').close())\n"
+        "t.start(); pipe.wait(); t.join()\n"
+        "print(_shm_name(pipe.path), flush=True)\n"
+        "os._exit(0)\n"
+    )
+    proc = sp.run([sys.executable, "-c", code], capture_output=True, text=True)
+    name = proc.stdout.strip()
+    assert name and "KeyError" not in proc.stderr
+    deadline = time.monotonic() + 10
+    while os.path.exists(f"/dev/shm/{name}") and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not os.path.exists(f"/dev/shm/{name}")
@@ -0,0 +1,65 @@
+import os
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_read, client_write
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="clients use threads on POSIX")
+
+
+def test_stats_disabled():
+    with npipe.NPopen("r") as pipe:
+        assert pipe.stats is None
+
+
+def test_stats_read():
+    msg = os.urandom(1_000_000)
+    with npipe.NPopen("r", stats=True) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, msg, 0.1))
+        t.start()
+        stream = pipe.wait()
+        assert stream.read() == msg
+        t.join()
+        stats = pipe.stats.snapshot()
+
+    assert stats["wait_time"] >= 0.05
+    assert stats["bytes_read"] == len(msg)
+    assert stats["reads"] > 1
+    assert stats["bytes_written"] == stats["writes"] == 0
+    assert stats["read_time"] > 0
+    assert stats["read_rate"] > 0
+
+
+def test_stats_write_hook():
+    msg = b"hello" * 1000
+    events = []
+    out = []
+    with npipe.NPopen(
+        "w", bufsize=0, stats=lambda *args: events.append(args)
+    ) as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out))
+        t.start()
+        stream = pipe.wait()
+        stream.write(msg)
+        pipe.writev([b"a", b"b"])
+        stream.close()
+        t.join()
+
+    assert out == [msg + b"ab"]
+    assert [e[0] for e in events] == ["wait", "write", "write"]
+    assert [e[1] for e in events] == [0, len(msg), 2]
+    assert pipe.stats.writes == 2
+    assert pipe.stats.bytes_written == len(msg) + 2
+
+
+def test_stats_text_mode():
+    with npipe.NPopen("rt", stats=True) as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, b"line1\nline2\n"))
+        t.start()
+        stream = pipe.wait()
+        assert stream.readlines() == ["line1\n", "line2\n"]
+        t.join()
+    assert pipe.stats.bytes_read == 12
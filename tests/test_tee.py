@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+
+import pytest
+
+import namedpipe as npipe
+from namedpipe import _tee
+
+from clients import client_read, client_write
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+DATA = os.urandom(3_000_000)
+CHUNKS = {"chunk_size": 100_000}
+
+
+@pytest.fixture(params=["tee", "copy"])
+def engine(request, monkeypatch):
+    if request.param == "copy":
+        monkeypatch.setattr(_tee, "_load_tee", lambda: None)
+    elif _tee._load_tee() is None:
+        pytest.skip("tee(2) is not available")
+    return request.param
+
+
+def run_tee(targets, data=DATA):
+    """tee DATA to (policy, delay) consumers and return (nbytes, outputs, tee)"""
+    outs = [[] for _ in targets]
+    with npipe.NPopen("r") as src:
+        pipes = [npipe.NPopen("w") for _ in targets]
+        threads = [
+            threading.Thread(target=client_write, args=(src.path, data), kwargs=CHUNKS)
+        ] + [
+            threading.Thread(target=client_read, args=(p.path, out, delay))
+            for p, out, (_, delay) in zip(pipes, outs, targets)
+        ]
+        for t in threads:
+            t.start()
+        src.wait()
+        tee = npipe.PipeTee(src)
+        for p, (policy, _) in zip(pipes, targets):
+            p.wait()
+            tee.add(p, policy)
+        n = tee.run()
+        for p in pipes:
+            p.close()
+        for t in threads:
+            t.join()
+    return n, [out[0] for out in outs], tee
+
+
+def test_tee_block(engine):
+    n, outs, tee = run_tee([("block", 0), ("block", 0.2), ("block", 0)])
+    assert n == len(DATA)
+    assert outs == [DATA] * 3
+    assert [t.nbytes for t in tee.targets] == [len(DATA)] * 3
+
+
+def test_tee_file_target(engine, tmp_path):
+    out = []
+    with npipe.NPopen("r") as src, npipe.NPopen("w") as dst:
+        threads = [
+            threading.Thread(target=client_write, args=(src.path, DATA), kwargs=CHUNKS),
+            threading.Thread(target=client_read, args=(dst.path, out)),
+        ]
+        for t in threads:
+            t.start()
+        src.wait()
+        dst.wait()
+        with open(tmp_path / "archive", "wb") as f:
+            assert npipe.PipeTee(src, [f, dst]).run() == len(DATA)
+        dst.close()
+        for t in threads:
+            t.join()
+    assert (tmp_path / "archive").read_bytes() == DATA
+    assert out == [DATA]
+
+
+def test_tee_drop(engine):
+    n, outs, tee = run_tee([("block", 0), ("drop", 0.5)])
+    assert outs[0] == DATA
+    fast, slow = tee.targets
+    assert slow.dropped > 0
+    assert slow.nbytes + slow.dropped == n == len(DATA)
+    assert len(outs[1]) == slow.nbytes
+
+
+def test_tee_buffer(engine):
+    n, outs, tee = run_tee([("block", 0), ("buffer", 0.3)])
+    assert outs == [DATA] * 2
+    assert tee.targets[1].buffered == 0
+
+
+def test_tee_broken_consumer(engine):
+    with npipe.NPopen("r") as src, npipe.NPopen("w") as dst, npipe.NPopen("w") as gone:
+        out = []
+        threads = [
+            threading.Thread(target=client_write, args=(src.path, DATA), kwargs=CHUNKS),
+            threading.Thread(target=client_read, args=(dst.path, out)),
+        ]
+        for t in threads:
+            t.start()
+        threading.Thread(target=lambda: open(gone.path, "rb").close()).start()
+        src.wait()
+        gone.wait()
+        dst.wait()
+        tee = npipe.PipeTee(src, [gone, dst])
+        time.sleep(0.1)  # let the consumer go away
+        assert tee.run() == len(DATA)
+        dst.close()
+        for t in threads:
+            t.join()
+    assert out == [DATA]
+    assert tee.targets[0].closed
+
+
+@pytest.fixture
+def high_fd():
+    """function moving a file descriptor above FD_SETSIZE (1024)"""
+    import resource
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    need = 2048
+    if soft < need:
+        if hard != resource.RLIM_INFINITY and hard < need:
+            pytest.skip("cannot raise the file descriptor limit")
+        resource.setrlimit(resource.RLIMIT_NOFILE, (need, hard))
+    numbers = iter(range(1500, need))
+
+    def move(fd):
+        new = next(numbers)
+        os.dup2(fd, new)
+        os.close(fd)
+        return new
+
+    yield move
+    resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_tee_high_fds(engine, high_fd):
+    src_r, src_w = (high_fd(fd) for fd in os.pipe())
+    dst_r, dst_w = (high_fd(fd) for fd in os.pipe())
+    out = []
+    threads = [
+        threading.Thread(target=client_write, args=(src_w, DATA), kwargs=CHUNKS),
+        threading.Thread(target=client_read, args=(dst_r, out, 0.2)),
+    ]
+    for t in threads:
+        t.start()
+    with open(src_r, "rb", buffering=0) as src, open(dst_w, "wb", buffering=0) as dst:
+        tee = npipe.PipeTee(src)
+        tee.add(dst, "buffer")  # waits for the slow consumer at the end
+        assert tee.run() == len(DATA)
+    for t in threads:
+        t.join()
+    assert out == [DATA]
+
+
+def test_tee_invalid_policy():
+    with pytest.raises(ValueError):
+        npipe.PipeTee(0).add(1, "wait")
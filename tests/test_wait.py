@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_read, client_write
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+
+@pytest.mark.parametrize("mode", ["r", "w"])
+def test_wait_timeout(mode):
+    with npipe.NPopen(mode) as pipe:
+        t0 = time.monotonic()
+        with pytest.raises(TimeoutError):
+            pipe.wait(timeout=0.1)
+        assert time.monotonic() - t0 < 1.0
+        assert not pipe
+
+
+def test_wait_timeout_read_connected():
+    msg = b"hello reader!!"
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(target=client_write, args=(pipe.path, msg))
+        t.start()
+        stream = pipe.wait(timeout=5)
+        assert stream.read() == msg
+        t.join()
+
+
+def test_wait_timeout_write_connected():
+    msg = b"hello writer!!"
+    out = []
+    with npipe.NPopen("w") as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out))
+        t.start()
+        stream = pipe.wait(timeout=5)
+        stream.write(msg)
+        stream.close()
+        t.join()
+    assert out == [msg]
+
+
+@pytest.mark.parametrize("mode", ["r", "w"])
+def test_wait_cancel_by_close(mode):
+    pipe = npipe.NPopen(mode)
+    errors = []
+
+    def waiter():
+        try:
+            pipe.wait()
+        except Exception as e:
+            errors.append(e)
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    time.sleep(0.1)
+    pipe.close()
+    t.join(timeout=2)
+    assert not t.is_alive()
+    assert len(errors) == 1 and isinstance(errors[0], RuntimeError)
+    assert not os.path.exists(pipe.path)
+
+
+@pytest.mark.parametrize("mode", ["r", "w"])
+def test_wait_after_close(mode):
+    pipe = npipe.NPopen(mode)
+    pipe.close()
+    with pytest.raises(RuntimeError):
+        pipe.wait()
+
+
+@pytest.mark.parametrize(
+    "mode, kwargs",
+    [
+        ("r", {}),
+        ("rt", {}),
+        ("r", {"bufsize": 0}),
+        ("r", {"stats": True}),
+        ("r", {"readahead": 2}),
+        ("w", {"writebehind": 1 << 16}),
+    ],
+)
+def test_wait_stream_name(mode, kwargs):
+    def client():
+        if pipe.readable():
+            client_write(pipe.path, b"")
+        else:
+            client_read(pipe.path, [])
+
+    with npipe.NPopen(mode, **kwargs) as pipe:
+        t = threading.Thread(target=client)
+        t.start()
+        stream = pipe.wait()
+        assert stream.name == pipe.path
+        stream.close()
+        t.join()
+
+
+def test_wait_read_returns_on_connection():
+    # wait() must not wait for data: the client writes only after it returns
+    connected = threading.Event()
+
+    def client():
+        with open(pipe.path, "wb") as f:
+            assert connected.wait(timeout=5)
+            f.write(b"data")
+
+    with npipe.NPopen("r") as pipe:
+        t = threading.Thread(target=client)
+        t.start()
+        stream = pipe.wait(timeout=5)
+        connected.set()
+        assert stream.read() == b"data"
+        t.join()
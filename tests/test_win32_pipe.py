@@ -0,0 +1,120 @@
+import ctypes
+
+import pytest
+
+from namedpipe import _win32
+
+PIPE_ACCESS_INBOUND = 0x00000001
+PIPE_ACCESS_OUTBOUND = 0x00000002
+FILE_FLAG_FIRST_PIPE_INSTANCE = 0x00080000
+ERROR_ACCESS_DENIED = 5
+
+
+class FakeKernel32:
+    """kernel32 stand-in recording the CreateNamedPipeW() calls"""
+
+    def __init__(self, used=()):
+        self.used = set(used)  # existing pipe paths
+        self.calls = []
+        self.error = 0
+        self.sizes = {}  # handle -> (out_size, in_size)
+
+    def CreateNamedPipeW(
+        self, path, mode, pipe_mode, instances, out, in_, timeout, sa
+    ):
+        args = [path, *(v.value for v in (mode, pipe_mode, instances, out, in_, timeout))]
+        self.calls.append(args)
+        if path in self.used:
+            self.error = ERROR_ACCESS_DENIED
+            return _win32.INVALID_HANDLE_VALUE
+        handle = 100 + len(self.calls)
+        self.sizes[handle] = (out.value or 4096, in_.value or 4096)
+        return handle
+
+    def ConnectNamedPipe(self, handle, ov):
+        return 1
+
+    def GetNamedPipeInfo(self, handle, flags, out, in_, instances):
+        out._obj.value, in_._obj.value = self.sizes[handle]
+        return 1
+
+    def CloseHandle(self, handle):
+        return 1
+
+
+@pytest.fixture
+def kernel32(monkeypatch):
+    k = FakeKernel32()
+    monkeypatch.setattr(_win32, "_kernel32", lambda: k)
+    monkeypatch.setattr(ctypes, "get_last_error", lambda: k.error, raising=False)
+    monkeypatch.setattr(
+        ctypes, "WinError", lambda code=None: OSError(code, "error"), raising=False
+    )
+    return k
+
+
+def create_args(kernel32, **kwargs):
+    _win32.NPopen("r", **kwargs).close()
+    path, mode, pipe_mode, instances, out_size, in_size, timeout = kernel32.calls[-1]
+    return {"mode": mode, "instances": instances, "out": out_size, "in": in_size}
+
+
+def test_default(kernel32):
+    args = create_args(kernel32)
+    assert args == {"mode": PIPE_ACCESS_INBOUND, "instances": 1, "out": 0, "in": 0}
+
+
+def test_pipe_size(kernel32):
+    args = create_args(kernel32, pipe_size=1 << 20)
+    assert (args["out"], args["in"]) == (1 << 20, 1 << 20)
+
+
+def test_buffer_sizes(kernel32):
+    args = create_args(kernel32, pipe_size=1 << 20, out_buffer_size=0)
+    assert (args["out"], args["in"]) == (0, 1 << 20)
+    args = create_args(kernel32, in_buffer_size=1 << 16, out_buffer_size=1 << 12)
+    assert (args["out"], args["in"]) == (1 << 12, 1 << 16)
+
+
+def test_max_instances(kernel32):
+    args = create_args(kernel32, max_instances=4, name="spam")
+    assert args["instances"] == 4
+    assert not args["mode"] & FILE_FLAG_FIRST_PIPE_INSTANCE
+
+    # a generated name is not shared with a pipe which already exists
+    kernel32.used.add(_win32._generate_pipe_path(str(_win32.id)))  # next name
+    args = create_args(kernel32, max_instances=_win32.PIPE_UNLIMITED_INSTANCES)
+    assert args["instances"] == 255
+    assert args["mode"] & FILE_FLAG_FIRST_PIPE_INSTANCE
+    assert kernel32.calls[-2][0] in kernel32.used  # retried with the next name
+    assert kernel32.calls[-1][0] not in kernel32.used
+
+
+def test_name_in_use(kernel32):
+    kernel32.used.add(r"\\.\pipe\spam")
+    with pytest.raises(OSError):
+        _win32.NPopen("w", name="spam", max_instances=2)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"pipe_size": 0},
+        {"in_buffer_size": -1},
+        {"out_buffer_size": -1},
+        {"max_instances": 0},
+        {"max_instances": 256},
+    ],
+)
+def test_invalid(kernel32, kwargs):
+    with pytest.raises(ValueError):
+        _win32.NPopen("r", **kwargs)
+    assert kernel32.calls == []
+
+
+@pytest.mark.parametrize("mode, expected", [("r", 1 << 16), ("w", 1 << 12)])
+def test_pipe_size_property(kernel32, mode, expected):
+    with _win32.NPopen(mode, in_buffer_size=1 << 16, out_buffer_size=1 << 12) as pipe:
+        assert pipe.pipe_size is None  # not connected yet
+        pipe.wait()
+        assert pipe.pipe_size == expected
@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_read
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="clients use threads on POSIX")
+
+
+def test_writebehind():
+    frames = [os.urandom(100_000) for _ in range(20)]
+    packets = [os.urandom(100) for _ in range(1000)]
+    out = []
+    with npipe.NPopen("w", writebehind=1 << 22, stats=True) as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out))
+        t.start()
+        stream = pipe.wait()
+        assert isinstance(stream, npipe.WriteBehindIO)
+        for f in frames:
+            stream.write(f)
+        for p in packets:
+            stream.write(p)
+        stream.drain()
+        # small writes combined into 64 KiB chunks
+        assert pipe.stats.writes < len(frames) * 3 + 10
+        stream.close()
+        t.join()
+    assert out == [b"".join(frames + packets)]
+
+
+def test_writebehind_does_not_block():
+    msg = os.urandom(1_000_000)
+    out = []
+    with npipe.NPopen("w", writebehind=1 << 22) as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out, 0.5))
+        t.start()
+        stream = pipe.wait()
+        t0 = time.monotonic()
+        stream.write(msg)
+        assert time.monotonic() - t0 < 0.25  # reader is still sleeping
+        stream.close()
+        t.join()
+    assert out == [msg]
+
+
+def test_writebehind_high_water():
+    out = []
+    with npipe.NPopen("w", writebehind=200_000) as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out, 0.3))
+        t.start()
+        stream = pipe.wait()
+        t0 = time.monotonic()
+        for _ in range(5):
+            stream.write(b"x" * 100_000)
+        assert time.monotonic() - t0 > 0.2  # blocked by high-water mark
+        stream.close()
+        t.join()
+    assert out == [b"x" * 500_000]
+
+
+def test_writebehind_text_writev():
+    out = []
+    with npipe.NPopen("wt", bufsize=16, writebehind=1024) as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out))
+        t.start()
+        stream = pipe.wait()
+        stream.write("hello\n" * 10)
+        stream.close()
+        t.join()
+    assert out == [b"hello\n" * 10]
+
+    out = []
+    with npipe.NPopen("w", writebehind=1024) as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out))
+        t.start()
+        stream = pipe.wait()
+        stream.write(b"abc")
+        pipe.writev([b"def"])  # waits for queued data
+        stream.close()
+        t.join()
+    assert out == [b"abcdef"]
+
+
+def test_writebehind_broken_pipe():
+    with npipe.NPopen("w", writebehind=1 << 20) as pipe:
+        t = threading.Thread(target=lambda: open(pipe.path, "rb").close())
+        t.start()
+        stream = pipe.wait()
+        t.join()
+        with pytest.raises(BrokenPipeError):
+            for _ in range(100):
+                stream.write(b"x" * 100_000)
+                stream.drain()
+
+
+def test_writebehind_read_mode():
+    with pytest.raises(ValueError):
+        npipe.NPopen("r", writebehind=1024)
@@ -0,0 +1,46 @@
+import os
+import threading
+
+import pytest
+
+import namedpipe as npipe
+
+from clients import client_read
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX only")
+
+
+@pytest.mark.parametrize("bufsize", [-1, 0])
+def test_writev(bufsize):
+    # Y, U, V planes larger than the pipe buffer to force partial writes
+    planes = [os.urandom(1920 * 1080), os.urandom(960 * 540), bytearray(960 * 540)]
+    out = []
+    with npipe.NPopen("w", bufsize=bufsize) as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out))
+        t.start()
+        stream = pipe.wait()
+        stream.write(b"header")
+        assert pipe.writev(planes) == sum(len(p) for p in planes)
+        assert pipe.writev([memoryview(b"tail"), b""]) == 4
+        stream.close()
+        t.join()
+    assert out == [b"header" + b"".join(planes) + b"tail"]
+
+
+def test_writev_many_buffers():
+    packets = [i.to_bytes(4, "little") for i in range(5000)]
+    out = []
+    with npipe.NPopen("w") as pipe:
+        t = threading.Thread(target=client_read, args=(pipe.path, out))
+        t.start()
+        pipe.wait()
+        assert pipe.writev(packets) == 4 * len(packets)
+        pipe.close()
+        t.join()
+    assert out == [b"".join(packets)]
+
+
+def test_writev_read_pipe():
+    with npipe.NPopen("r") as pipe:
+        with pytest.raises(RuntimeError):
+            pipe.writev([b"data"])